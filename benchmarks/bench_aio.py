@@ -0,0 +1,77 @@
+"""Measures event loop lag while a coroutine logs heavily, comparing the synchronous pyoslog methods with pyoslog.aio.
+
+Run from the repository root: `python benchmarks/bench_aio.py [message count]`. On platforms where pyoslog is not
+supported, messages are recorded by a pyoslog.capture.LogCapture instead, so only relative results are meaningful."""
+import asyncio
+import statistics
+import sys
+import time
+
+import pyoslog
+from pyoslog import aio, capture, core
+
+MESSAGE_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+TICK_INTERVAL = 0.001
+
+
+async def measure_lag(producer):
+    lags = []
+    finished = asyncio.Event()
+
+    async def ticker():
+        while not finished.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            lags.append(time.perf_counter() - start - TICK_INTERVAL)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await producer()
+    await aio.flush()
+    duration = time.perf_counter() - start
+    finished.set()
+    await ticker_task
+    return duration, lags
+
+
+async def sync_producer():
+    for i in range(MESSAGE_COUNT):
+        core.log('Benchmark message', i)
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # yield as a typical coroutine would
+
+
+async def aio_producer():
+    for i in range(MESSAGE_COUNT):
+        await aio.log('Benchmark message', i)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+
+
+async def aio_nowait_producer():
+    for i in range(MESSAGE_COUNT):
+        aio.log_nowait('Benchmark message', i)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+
+
+async def main():
+    print('Logging %d messages (%s)' % (MESSAGE_COUNT, 'unified log' if pyoslog.is_supported() else 'LogCapture'))
+    print('%-20s %10s %14s %14s %14s' % ('method', 'total (s)', 'mean lag (ms)', 'p99 lag (ms)', 'max lag (ms)'))
+    for name, producer in [('pyoslog.log', sync_producer), ('aio.log', aio_producer),
+                           ('aio.log_nowait', aio_nowait_producer)]:
+        duration, lags = await measure_lag(producer)
+        lags = sorted(lags) or [0.0]
+        print('%-20s %10.3f %14.3f %14.3f %14.3f' % (name, duration, 1000 * statistics.mean(lags),
+                                                      1000 * lags[int(0.99 * (len(lags) - 1))], 1000 * lags[-1]))
+    await aio.shutdown()
+
+
+if __name__ == '__main__':
+    event_loop = asyncio.new_event_loop()
+    if pyoslog.is_supported():
+        event_loop.run_until_complete(main())
+    else:
+        with capture.LogCapture():
+            event_loop.run_until_complete(main())
+    event_loop.close()
@@ -0,0 +1,51 @@
+"""Measures the per-message cost of logging via the standard library's Logger and pyoslog.Handler, compared with
+pyoslog.Logger, for messages that are sent and for those that are filtered out by level.
+
+Run from the repository root: `python benchmarks/bench_logger.py [message count]`. On platforms where pyoslog is not
+supported, messages are recorded by a pyoslog.capture.LogCapture instead, so only relative results are meaningful."""
+import logging
+import sys
+import timeit
+
+import pyoslog
+from pyoslog import capture, handler, logger
+
+MESSAGE_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+REPEATS = 5
+
+
+def create_stdlib_logger():
+    stdlib_logger = logging.getLogger('bench.stdlib')
+    stdlib_logger.addHandler(handler.Handler())
+    stdlib_logger.setLevel(logging.INFO)
+    stdlib_logger.propagate = False
+    return stdlib_logger
+
+
+def create_pyoslog_logger():
+    pyoslog_logger = logger.getLogger('bench.pyoslog')
+    pyoslog_logger.setLevel(logging.INFO)
+    pyoslog_logger.propagate = False
+    return pyoslog_logger
+
+
+def main():
+    print('Logging %d messages, best of %d (%s)' % (MESSAGE_COUNT, REPEATS,
+                                                   'unified log' if pyoslog.is_supported() else 'LogCapture'))
+    print('%-52s %10s %18s' % ('method', 'total (s)', 'per message (us)'))
+    for name, bench_logger in [('logging.Logger + pyoslog.Handler', create_stdlib_logger()),
+                               ('pyoslog.Logger', create_pyoslog_logger())]:
+        for description, statement in [('info', lambda: bench_logger.info('Benchmark message %d', 42)),
+                                       ('debug (filtered)', lambda: bench_logger.debug('Benchmark message %d', 42))]:
+            duration = min(timeit.repeat(statement, number=MESSAGE_COUNT, repeat=REPEATS))
+            print('%-52s %10.3f %18.3f' % ('%s: %s' % (name, description), duration,
+                                           1000000 * duration / MESSAGE_COUNT))
+
+
+if __name__ == '__main__':
+    if pyoslog.is_supported():
+        main()
+    else:
+        with capture.LogCapture() as log_capture:
+            log_capture.os_log_with_type = lambda *args: None  # don't keep millions of messages in memory
+            main()
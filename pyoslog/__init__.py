@@ -1,15 +1,35 @@
 from .compatibility import is_supported
 
 if is_supported():
+    from .accounting import *
+    from .bound import *
     from .core import *
     from .handler import *
+    from .logger import *
+    from .packing import *
+    from .stream import *
 
     # remove globals so they are not revealed to importers
+    del accounting  # type: ignore
+    del bound  # type: ignore
     del core  # type: ignore
     del handler  # type: ignore
+    del logger  # type: ignore
+    del packing  # type: ignore
+    del stream  # type: ignore
 
+    del contextlib
+    del contextvars
+    del sys
+    del traceback
     del py_object
     del os_log_t
     del Any
+    del Callable
+    del Dict
+    del Iterator
+    del Optional
+    del Sequence
+    del Tuple
 
 del compatibility  # type: ignore
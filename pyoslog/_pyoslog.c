@@ -1,3 +1,8 @@
+#include <errno.h>
+#include <signal.h>
+#include <string.h>
+#include <unistd.h>
+
 #include <os/log.h>
 #include <os/object.h>
 
@@ -211,6 +216,189 @@ static PyObject *py__get_os_log_default(PyObject *self, PyObject *args) {
   return PyCapsule_New(log, "os_log_t", os_log_release);
 }
 
+/* -------------------------------------------------------------------------- */
+
+// fault logging (see faulthandler.py): the standard library's faulthandler
+// module writes its traceback to a pipe, then calls the previous handler for
+// the signal - which is fault_signal_handler. This reads the pipe and sends
+// its contents to the unified log. Everything the handler uses is allocated in
+// advance, and it never calls the Python API, so it does not need the GIL
+#define FAULT_BUFFER_SIZE 65536
+#define FAULT_ENTRY_SIZE 1024 // the platform truncates longer messages
+
+static const int fault_signals[] = {SIGSEGV, SIGFPE, SIGABRT, SIGBUS, SIGILL};
+#define FAULT_SIGNAL_COUNT (sizeof(fault_signals) / sizeof(fault_signals[0]))
+
+static struct {
+  int enabled;
+  int read_fd;
+  int echo_fd;
+  int log_disabled;
+  os_log_t log;
+  PyObject *py_log; // keeps the log object alive while enabled
+  struct sigaction previous[FAULT_SIGNAL_COUNT];
+  char buffer[FAULT_BUFFER_SIZE];
+  char entry[FAULT_ENTRY_SIZE];
+} fault_state = {.enabled = 0, .read_fd = -1, .echo_fd = -1};
+
+static const char fault_no_traceback[] =
+    "Fatal error: signal received (no traceback available)";
+
+static void fault_log_entry(size_t start, size_t end) {
+  size_t size = end - start;
+  if (size > 0 && fault_state.buffer[end - 1] == '\n') {
+    size--;
+  }
+  if (size == 0) {
+    return;
+  }
+  memcpy(fault_state.entry, fault_state.buffer + start, size);
+  fault_state.entry[size] = '\0';
+  os_log_with_type(fault_state.log_disabled ? OS_LOG_DISABLED : fault_state.log,
+                   OS_LOG_TYPE_FAULT, "%{public}s", fault_state.entry);
+}
+
+static void fault_signal_handler(int signum) {
+  int saved_errno = errno;
+
+  // the pipe is non-blocking, so this stops once everything written is read
+  size_t length = 0;
+  while (length < FAULT_BUFFER_SIZE) {
+    ssize_t count = read(fault_state.read_fd, fault_state.buffer + length,
+                         FAULT_BUFFER_SIZE - length);
+    if (count > 0) {
+      length += count;
+    } else if (count < 0 && errno == EINTR) {
+      continue;
+    } else {
+      break;
+    }
+  }
+  if (length == 0) { // e.g., faulthandler was disabled separately
+    length = sizeof(fault_no_traceback) - 1;
+    memcpy(fault_state.buffer, fault_no_traceback, length);
+  }
+
+  if (fault_state.echo_fd >= 0) {
+    size_t written = 0;
+    while (written < length) {
+      ssize_t count = write(fault_state.echo_fd, fault_state.buffer + written,
+                            length - written);
+      if (count < 0 && errno == EINTR) {
+        continue;
+      } else if (count <= 0) {
+        break;
+      }
+      written += count;
+    }
+  }
+
+  // send as many entries as needed, splitting at line breaks where possible
+  size_t start = 0;
+  while (start < length) {
+    size_t end = length;
+    if (end - start > FAULT_ENTRY_SIZE - 1) {
+      end = start + FAULT_ENTRY_SIZE - 1;
+      size_t line_end = end;
+      while (line_end > start && fault_state.buffer[line_end - 1] != '\n') {
+        line_end--;
+      }
+      if (line_end > start) {
+        end = line_end;
+      }
+    }
+    fault_log_entry(start, end);
+    start = end;
+  }
+
+  // restore the handler that was in place before enabling, then raise the
+  // signal again so that the process exits as it would have otherwise
+  for (size_t i = 0; i < FAULT_SIGNAL_COUNT; i++) {
+    if (fault_signals[i] == signum) {
+      sigaction(signum, &fault_state.previous[i], NULL);
+    }
+  }
+  errno = saved_errno;
+  raise(signum);
+}
+
+static void fault_restore_handlers(size_t count) {
+  for (size_t i = 0; i < count; i++) {
+    sigaction(fault_signals[i], &fault_state.previous[i], NULL);
+  }
+}
+
+static int fault_disable(void) {
+  if (!fault_state.enabled) {
+    return 0;
+  }
+  fault_restore_handlers(FAULT_SIGNAL_COUNT);
+  fault_state.enabled = 0;
+  fault_state.read_fd = -1;
+  fault_state.echo_fd = -1;
+  Py_CLEAR(fault_state.py_log);
+  return 1;
+}
+
+static PyObject *py__faulthandler_enable(PyObject *self, PyObject *args) {
+  PyObject *py_log;
+  int read_fd;
+  int echo_fd;
+
+  // automatically sets an exception on failure
+  if (!PyArg_ParseTuple(args, "Oii", &py_log, &read_fd, &echo_fd)) {
+    return NULL;
+  }
+
+  os_log_t *log = NULL;
+  int log_disabled = 0;
+  if (PyCapsule_IsValid(py_log, "os_log_t")) {
+    log = (os_log_t *)PyCapsule_GetPointer(py_log, "os_log_t");
+  } else if (py_log == Py_None) {
+    log_disabled = 1;
+  }
+  if (!log && !log_disabled) {
+    PyErr_SetString(PyExc_TypeError,
+                    "invalid log_object - must be pyoslog.OS_LOG_DEFAULT, "
+                    "pyoslog.OS_LOG_DISABLED (== None), or an object "
+                    "initialised with pyoslog.os_log_create");
+    return NULL;
+  }
+
+  fault_disable();
+  fault_state.read_fd = read_fd;
+  fault_state.echo_fd = echo_fd;
+  fault_state.log_disabled = log_disabled;
+  fault_state.log = log_disabled ? OS_LOG_DISABLED : *log;
+
+  struct sigaction action;
+  memset(&action, 0, sizeof(action));
+  action.sa_handler = fault_signal_handler;
+  sigemptyset(&action.sa_mask);
+  // as for faulthandler - SA_NODEFER allows the signal to be raised again
+  action.sa_flags = SA_NODEFER | SA_ONSTACK;
+  for (size_t i = 0; i < FAULT_SIGNAL_COUNT; i++) {
+    if (sigaction(fault_signals[i], &action, &fault_state.previous[i]) != 0) {
+      PyErr_SetFromErrno(PyExc_OSError);
+      fault_restore_handlers(i);
+      return NULL;
+    }
+  }
+
+  Py_INCREF(py_log);
+  fault_state.py_log = py_log;
+  fault_state.enabled = 1;
+  Py_RETURN_NONE;
+}
+
+static PyObject *py__faulthandler_disable(PyObject *self, PyObject *args) {
+  // automatically sets an exception on failure (no arguments expected)
+  if (!PyArg_ParseTuple(args, "")) {
+    return NULL;
+  }
+  return PyBool_FromLong(fault_disable());
+}
+
 // TODO: are there any additional methods worth implementing?
 // https://opensource.apple.com/source/xnu/xnu-3789.21.4/libkern/os/log.h.auto.html
 static PyMethodDef module_methods[] = {
@@ -230,6 +418,14 @@ static PyMethodDef module_methods[] = {
      .ml_meth = (PyCFunction)py__get_os_log_default,
      .ml_flags = METH_VARARGS,
      .ml_doc = NULL},
+    {.ml_name = "_faulthandler_enable",
+     .ml_meth = (PyCFunction)py__faulthandler_enable,
+     .ml_flags = METH_VARARGS,
+     .ml_doc = NULL},
+    {.ml_name = "_faulthandler_disable",
+     .ml_meth = (PyCFunction)py__faulthandler_disable,
+     .ml_flags = METH_VARARGS,
+     .ml_doc = NULL},
     {.ml_name = NULL} /* sentinel */
 };
 
@@ -0,0 +1,170 @@
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import core
+
+# only the public accounting methods should be visible when using `from accounting import *`
+__all__ = ['Hotspot', 'enable_hotspots', 'disable_hotspots', 'hotspots']
+
+Hotspot = NamedTuple('Hotspot', [('filename', str), ('lineno', int), ('function', str), ('calls', int),
+                                 ('bytes', int), ('seconds', float)])
+Hotspot.__doc__ = ('A location in the code that sends messages to pyoslog, with (estimated) totals for the number of '
+                   'calls made, the bytes logged, and the time spent logging. See :py:func:`hotspots`.')
+
+_Location = Tuple[str, int, str]
+
+# frames in these files are skipped when finding the code that sent a message
+_IGNORED_FILENAMES = (os.path.dirname(os.path.abspath(__file__)) + os.sep, os.path.abspath(logging.__file__))
+
+
+class _Accounting:
+    def __init__(self, sample_interval: int, max_locations: int) -> None:
+        self.sample_interval = sample_interval
+        self.max_locations = max_locations
+        self.locations = {}  # type: Dict[_Location, List[Any]]  # location -> [samples, bytes, seconds]
+        self.lock = threading.Lock()
+        self._countdown = sample_interval
+
+    def sample(self) -> bool:
+        # not thread-safe, but an occasional missed or extra sample does not matter
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.sample_interval
+        return True
+
+    def measure(self, location: Optional[_Location], method: Callable[..., None], log_object: core.os_log_t,
+                log_type: int, message: str, sinks: Any, start: Optional[float] = None) -> None:
+        if start is None:
+            start = time.perf_counter()
+        try:
+            method(log_object, log_type, message, sinks)
+        finally:
+            self.record_since(location, message, start)
+
+    def record_since(self, location: Optional[_Location], message: str, start: float) -> None:
+        self.record(location or _find_caller(), len(message.encode('utf-8', 'replace')), time.perf_counter() - start)
+
+    def record(self, location: _Location, message_bytes: int, seconds: float) -> None:
+        with self.lock:
+            totals = self.locations.get(location)
+            if totals is None:
+                if len(self.locations) >= self.max_locations:
+                    # space-saving: replace the least frequent location, whose counts are inherited as an upper bound
+                    least_frequent = min(self.locations, key=lambda key: self.locations[key][0])
+                    totals = self.locations.pop(least_frequent)
+                else:
+                    totals = [0, 0, 0.0]
+                self.locations[location] = totals
+            totals[0] += 1
+            totals[1] += message_bytes
+            totals[2] += seconds
+
+    def hotspots(self, limit: Optional[int]) -> List[Hotspot]:
+        with self.lock:
+            ordered = sorted(self.locations.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [Hotspot(location[0], location[1], location[2], totals[0] * self.sample_interval,
+                        totals[1] * self.sample_interval, totals[2] * self.sample_interval)
+                for location, totals in ordered]
+
+
+def _find_caller() -> _Location:
+    frame = sys._getframe(1)  # type: Any
+    while frame is not None and frame.f_code.co_filename.startswith(_IGNORED_FILENAMES):
+        frame = frame.f_back
+    if frame is None:
+        return '(unknown file)', 0, '(unknown function)'
+    return frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name
+
+
+class _SummaryTimer:
+    def __init__(self, interval: float, log_object: core.os_log_t, limit: int) -> None:
+        self.interval = interval
+        self.log_object = log_object
+        self.limit = limit
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='pyoslog-hotspots', daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            _log_summary(self.log_object, self.limit)
+
+
+_summary_timer = None  # type: Optional[_SummaryTimer]
+_last_accounting = None  # type: Optional[_Accounting]  # kept so that hotspots() still works after disabling
+
+
+def _log_summary(log_object: core.os_log_t, limit: int = 10) -> None:
+    # sends the current hotspots to log_object, split into as many messages as needed to stay within the length limit
+    lines = ['%s:%d (%s): %d calls, %d bytes, %.3f ms' % (h.filename, h.lineno, h.function, h.calls, h.bytes,
+                                                           1000 * h.seconds) for h in hotspots(limit)]
+    message = 'pyoslog hotspots:'
+    for line in lines:
+        if len(message) + 1 + len(line) > core._MAX_MESSAGE_LENGTH:
+            # noinspection PyProtectedMember
+            core._os_log_with_type(log_object, core.OS_LOG_TYPE_DEFAULT, message, None)
+            message = 'pyoslog hotspots (continued):'
+        message += '\n' + line[:core._MAX_MESSAGE_LENGTH - len(message) - 1]
+    # noinspection PyProtectedMember
+    core._os_log_with_type(log_object, core.OS_LOG_TYPE_DEFAULT, message, None)
+
+
+def enable_hotspots(sample_interval: int = 100, max_locations: int = 100, summary_interval: Optional[float] = None,
+                    summary_log_object: Optional[core.os_log_t] = None) -> None:
+    """Starts recording which lines of code send the most messages via pyoslog (including via :py:class:`Handler` and
+    :py:mod:`pyoslog.aio`). Only one in every ``sample_interval`` messages is measured, so the overhead is low enough to
+    leave enabled; totals are estimated from these samples. Enabling again resets any existing totals.
+
+    :param sample_interval: Measure one in every ``sample_interval`` messages. Use ``1`` to measure every message.
+    :type sample_interval: int = 100
+    :param max_locations: The number of locations to keep totals for. When this is exceeded, the least frequent
+                          location is replaced, so totals for infrequent locations are approximate.
+    :type max_locations: int = 100
+    :param summary_interval: If set, a summary of the top hotspots is sent to ``summary_log_object`` every
+                             ``summary_interval`` seconds.
+    :type summary_interval: Optional[float]
+    :param summary_log_object: The log object for summaries. Defaults to a log object with the subsystem ``pyoslog``
+                               and category ``hotspots``.
+    :type summary_log_object: Optional[os_log_t]
+    """
+    global _summary_timer
+    if sample_interval < 1 or max_locations < 1:
+        raise ValueError('sample_interval and max_locations must be at least 1')
+
+    disable_hotspots()
+    core._accounting = _Accounting(sample_interval, max_locations)
+    if summary_interval is not None:
+        if summary_log_object is None:
+            summary_log_object = core.os_log_create('pyoslog', 'hotspots')
+        _summary_timer = _SummaryTimer(summary_interval, summary_log_object, 10)
+
+
+def disable_hotspots() -> None:
+    """Stops recording hotspots (and sending summaries). The totals recorded so far remain available via
+    :py:func:`hotspots` until recording is enabled again."""
+    global _summary_timer, _last_accounting
+    if _summary_timer is not None:
+        _summary_timer.stopped.set()
+        _summary_timer = None
+    accounting = core._accounting
+    if accounting is not None:
+        _last_accounting = accounting
+        core._accounting = None
+
+
+def hotspots(limit: Optional[int] = 10) -> List[Hotspot]:
+    """Returns the locations that have sent the most messages since :py:func:`enable_hotspots` was called, most
+    frequent first. Returns an empty list if recording has never been enabled.
+
+    :param limit: The maximum number of locations to return, or ``None`` to return all of them.
+    :type limit: Optional[int] = 10
+    """
+    accounting = core._accounting
+    if accounting is None:
+        accounting = _last_accounting
+    return [] if accounting is None else accounting.hotspots(limit)
@@ -0,0 +1,245 @@
+"""Asynchronous versions of pyoslog's logging methods, for use from coroutines. Messages are checked and formatted on
+the calling thread, then added to a buffer that belongs to the running event loop. While a loop's buffer contains
+messages, a background task passes them in batches to a logging thread (shared by all event loops), so the native
+logging calls never run on the event loop itself. Messages are always logged in the order they were sent from each loop.
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from . import core
+from .handler import Handler
+
+__all__ = ['os_log_with_type', 'os_log_with_type_nowait', 'log', 'log_nowait', 'flush', 'shutdown', 'AsyncHandler']
+
+MAX_BUFFER_SIZE = 10000  # messages waiting per event loop before callers have to wait (or log synchronously)
+BATCH_SIZE = 256  # the maximum number of messages passed to the logging thread at once
+
+_Message = Tuple[core.os_log_t, int, str, Optional[Sequence[Callable[[core.os_log_t, int, str], None]]]]
+
+_executor = None  # type: Optional[concurrent.futures.ThreadPoolExecutor]
+_executor_lock = threading.Lock()
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:  # python 3.6
+        # noinspection PyProtectedMember,PyUnresolvedReferences
+        return asyncio._get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyoslog-aio')
+        return _executor
+
+
+def _write_batch(batch: List[_Message]) -> None:
+    for log_object, log_type, message, sinks in batch:
+        # noinspection PyProtectedMember
+        core._os_log_with_type(log_object, log_type, message, sinks)
+
+
+class _LoopBuffer:
+    # created when a loop first buffers a message, and discarded (along with its task) as soon as it is empty again, so
+    # that idle event loops are not kept alive, and loops that are closed while idle leave nothing behind
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue = asyncio.Queue(MAX_BUFFER_SIZE)  # type: asyncio.Queue
+        self.writing = None  # type: Optional[Tuple[List[_Message], concurrent.futures.Future]]
+        self.task = loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        try:
+            while not self.queue.empty():
+                batch = []  # type: List[_Message]
+                while len(batch) < BATCH_SIZE and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                writing = self.writing = batch, _get_executor().submit(_write_batch, batch)
+                await asyncio.wrap_future(writing[1])
+                if self.writing is writing:  # otherwise, write_buffered() has already waited for this batch
+                    self.writing = None
+                    for _ in batch:
+                        self.queue.task_done()
+        except BaseException:
+            # the loop is shutting down (e.g., at the end of asyncio.run()), or writing failed - write everything that
+            # remains directly, so that messages are not lost and stay in order
+            self.write_buffered(cancel=True)
+            raise
+        finally:
+            if _buffers.get(self.loop) is self:
+                del _buffers[self.loop]
+
+    def write_buffered(self, *messages: _Message, cancel: bool = False) -> None:
+        # writes every buffered message, followed by `messages`, directly from the calling thread; the batch that was
+        # passed to the logging thread (if any) is finished first, or written here instead if `cancel` is True and the
+        # logging thread has not started it yet
+        if self.writing is not None:
+            batch, writing = self.writing
+            self.writing = None
+            if cancel and writing.cancel():
+                _write_batch(batch)
+            else:
+                concurrent.futures.wait([writing])
+            for _ in batch:
+                self.queue.task_done()
+
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+            self.queue.task_done()
+        _write_batch(remaining + list(messages))
+
+
+_buffers = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def _get_buffer(loop: asyncio.AbstractEventLoop) -> _LoopBuffer:
+    loop_buffer = _buffers.get(loop)
+    if loop_buffer is None:
+        _write_abandoned_buffers()
+        loop_buffer = _buffers[loop] = _LoopBuffer(loop)
+    return loop_buffer
+
+
+def _write_abandoned_buffers() -> None:
+    # a loop that was closed without calling shutdown() (or running its tasks to completion) can no longer run its
+    # buffer's task, so any messages that were still buffered are written here instead, and the buffer is discarded
+    for loop, loop_buffer in list(_buffers.items()):
+        if loop.is_closed():
+            del _buffers[loop]
+            try:
+                # the task can never finish, but its messages are written below, so asyncio's warning when the task is
+                # collected would be misleading; this is the flag asyncio itself clears for tasks that it abandons
+                # noinspection PyProtectedMember
+                loop_buffer.task._log_destroy_pending = False
+            except AttributeError:  # pragma: no cover
+                pass  # the only consequence is the warning
+            loop_buffer.write_buffered()
+
+
+atexit.register(_write_abandoned_buffers)
+
+
+def _start_measuring() -> Optional[float]:
+    # returns the start time if this call is one of the samples measured for pyoslog.hotspots() (see accounting.py)
+    # noinspection PyProtectedMember
+    accounting = core._accounting
+    return time.perf_counter() if accounting is not None and accounting.sample() else None
+
+
+def _prepare(log_object: core.os_log_t, log_type: int, message: Sequence[Any],
+             sinks: Optional[Sequence[Callable[[core.os_log_t, int, str], None]]], start: Optional[float],
+             location: Optional[Tuple[str, int, str]] = None) -> Optional[_Message]:
+    # checking here also validates log_object and log_type, so errors are raised to the caller rather than the logging
+    # thread; it also avoids formatting and buffering messages that would not be logged anyway
+    if not core.os_log_type_enabled(log_object, log_type):
+        return None
+    # the logging thread does not share the caller's context, so any scope() must be applied now
+    # noinspection PyProtectedMember
+    prepared_message = core._resolve_log_object(log_object), log_type, ' '.join(map(str, message)), sinks
+
+    # for sampled calls, the time recorded is that spent on the event loop, as the native call happens on another thread
+    # noinspection PyProtectedMember
+    accounting = core._accounting
+    if start is not None and accounting is not None:
+        accounting.record_since(location, prepared_message[2], start)
+    return prepared_message
+
+
+async def os_log_with_type(log_object: core.os_log_t, log_type: int, *message: Any,
+                           sinks: Optional[Sequence[Callable[[core.os_log_t, int, str], None]]] = None) -> None:
+    """The asynchronous equivalent of :py:func:`pyoslog.os_log_with_type`. The message is added to the running event
+    loop's buffer; if the buffer is full, this method waits until there is space."""
+    prepared_message = _prepare(log_object, log_type, message, sinks, _start_measuring())
+    if prepared_message is not None:
+        await _get_buffer(asyncio.get_event_loop()).queue.put(prepared_message)
+
+
+def os_log_with_type_nowait(log_object: core.os_log_t, log_type: int, *message: Any,
+                            sinks: Optional[Sequence[Callable[[core.os_log_t, int, str], None]]] = None) -> None:
+    """A fire-and-forget version of :py:func:`os_log_with_type` that can be called without ``await``. If there is no
+    running event loop, the message is logged synchronously instead. If the loop's buffer is full, all of its messages
+    are logged synchronously, followed by this one."""
+    _log_nowait(_prepare(log_object, log_type, message, sinks, _start_measuring()))
+
+
+def _log_nowait(prepared_message: Optional[_Message]) -> None:
+    if prepared_message is None:
+        return
+
+    loop = _get_running_loop()
+    if loop is None:
+        _write_batch([prepared_message])
+        return
+
+    loop_buffer = _get_buffer(loop)
+    try:
+        loop_buffer.queue.put_nowait(prepared_message)
+    except asyncio.QueueFull:
+        # logging synchronously is preferable to dropping the message, but everything already buffered must be written
+        # first (blocking the loop until then) so that messages stay in order
+        loop_buffer.write_buffered(prepared_message)
+
+
+async def log(*message: Any, log_object: core.os_log_t = core.OS_LOG_DEFAULT,
+              log_type: int = core.OS_LOG_TYPE_DEFAULT) -> None:
+    """The asynchronous equivalent of :py:func:`pyoslog.log`."""
+    await os_log_with_type(log_object, log_type, *message)
+
+
+def log_nowait(*message: Any, log_object: core.os_log_t = core.OS_LOG_DEFAULT,
+               log_type: int = core.OS_LOG_TYPE_DEFAULT) -> None:
+    """The fire-and-forget equivalent of :py:func:`pyoslog.log` (see :py:func:`os_log_with_type_nowait`)."""
+    os_log_with_type_nowait(log_object, log_type, *message)
+
+
+async def flush() -> None:
+    """Waits until every message buffered by the running event loop has been logged."""
+    loop_buffer = _buffers.get(asyncio.get_event_loop())
+    if loop_buffer is not None:
+        await loop_buffer.queue.join()
+
+
+async def shutdown() -> None:
+    """Logs any remaining messages and stops the running event loop's background logging task. This happens
+    automatically when using ``asyncio.run()``, but should be called before closing event loops that are managed
+    manually (otherwise, their remaining messages are not logged until another event loop starts buffering messages, or
+    the process exits). Logging again after calling this method starts a new background task."""
+    loop_buffer = _buffers.get(asyncio.get_event_loop())
+    if loop_buffer is not None:
+        await loop_buffer.queue.join()
+        loop_buffer.task.cancel()
+        try:
+            await loop_buffer.task
+        except asyncio.CancelledError:
+            pass
+
+
+class AsyncHandler(Handler):
+    """A version of :py:class:`pyoslog.Handler` for use in asyncio applications. Records are formatted when they are
+    emitted, then logged in the background as described for :py:func:`os_log_with_type_nowait`. Records emitted from
+    threads other than the one running the event loop are logged synchronously."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Emit a record via the running event loop's buffer. (note: excluded from built documentation as this method
+        is not intended to be called directly.)"""
+        try:
+            # as for Handler, the record knows where it came from, and formatting time is included when measuring
+            start = _start_measuring()
+            _log_nowait(_prepare(self._log_object, Handler._get_pyoslog_type(record.levelno), (self.format(record),),
+                                 self._sinks, start, (record.pathname, record.lineno, record.funcName)))
+        except RecursionError:  # as in logging.StreamHandler.emit()
+            raise
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,70 @@
+from typing import Any, Dict
+
+from .core import *
+
+# only the BoundLogger and bind() should be visible when using `from bound import *`
+__all__ = ['BoundLogger', 'bind']
+
+
+def _render(context: Dict[str, Any]) -> str:
+    return ''.join('%s=%s ' % item for item in context.items())
+
+
+class BoundLogger:
+    """Sends messages to a log object, prefixing each one with a fixed set of ``key=value`` context pairs (e.g., a
+    request ID). The prefix is rendered once when the logger is created, and messages are only formatted if their type
+    is enabled for the log object. Create instances via :py:func:`bind` rather than directly."""
+
+    def __init__(self, log_object: os_log_t, context: Dict[str, Any], prefix: str) -> None:
+        self.log_object = log_object
+        self._context = context
+        self._prefix = prefix
+
+    def __repr__(self) -> str:
+        return '<BoundLogger %s %s>' % (self.log_object, self._context)
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """A copy of the context that is added to each message."""
+        return dict(self._context)
+
+    def bind(self, **context: Any) -> 'BoundLogger':
+        """Returns a new logger with the same log object, and this logger's context extended by ``context``."""
+        if any(key in self._context for key in context):
+            merged_context = dict(self._context, **context)
+            return BoundLogger(self.log_object, merged_context, _render(merged_context))
+        return BoundLogger(self.log_object, dict(self._context, **context), self._prefix + _render(context))
+
+    def log(self, *message: Any, log_type: int = OS_LOG_TYPE_DEFAULT) -> None:
+        """Equivalent to :py:func:`pyoslog.log`, but with this logger's context and log object."""
+        if os_log_type_enabled(self.log_object, log_type):
+            os_log_with_type(self.log_object, log_type,
+                             self._prefix + (message[0] if len(message) == 1 and isinstance(message[0], str) else
+                                             ' '.join(map(str, message))))
+
+    def default(self, *message: Any) -> None:
+        """Sends a default-level message (see :py:func:`log`)."""
+        self.log(*message, log_type=OS_LOG_TYPE_DEFAULT)
+
+    def info(self, *message: Any) -> None:
+        """Sends an info-level message (see :py:func:`log`)."""
+        self.log(*message, log_type=OS_LOG_TYPE_INFO)
+
+    def debug(self, *message: Any) -> None:
+        """Sends a debug-level message (see :py:func:`log`)."""
+        self.log(*message, log_type=OS_LOG_TYPE_DEBUG)
+
+    def error(self, *message: Any) -> None:
+        """Sends an error-level message (see :py:func:`log`)."""
+        self.log(*message, log_type=OS_LOG_TYPE_ERROR)
+
+    def fault(self, *message: Any) -> None:
+        """Sends a fault-level message (see :py:func:`log`)."""
+        self.log(*message, log_type=OS_LOG_TYPE_FAULT)
+
+
+def bind(log_object: os_log_t = OS_LOG_DEFAULT, **context: Any) -> BoundLogger:
+    """Returns a :py:class:`BoundLogger` that sends messages to ``log_object``, each prefixed with ``context`` as
+    ``key=value`` pairs. For example, ``bind(log, request='a1').error('Failed')`` sends the message
+    ``'request=a1 Failed'``. Call ``bind()`` on the result to add further context."""
+    return BoundLogger(log_object, context, _render(context))
@@ -0,0 +1,174 @@
+import re
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+from . import core
+
+LogEntry = NamedTuple('LogEntry', [('subsystem', Optional[str]), ('category', Optional[str]), ('type', int),
+                                   ('message', str), ('timestamp', float)])
+LogEntry.__doc__ = 'A single message recorded by :py:class:`LogCapture` (or read from a spool file).'
+
+_LOG_TYPES = (core.OS_LOG_TYPE_DEFAULT, core.OS_LOG_TYPE_INFO, core.OS_LOG_TYPE_DEBUG, core.OS_LOG_TYPE_ERROR,
+              core.OS_LOG_TYPE_FAULT)
+
+
+class _CapturedLog:
+    """Stands in for a native os_log_t object while a capture is installed."""
+
+    def __init__(self, subsystem: str, category: str) -> None:
+        self.subsystem = subsystem
+        self.category = category
+
+
+class LogCapture:
+    """An alternative backend for pyoslog that records messages in memory rather than sending them to the unified log.
+    Once installed (either via :py:func:`install` or by using the capture as a context manager), every pyoslog method,
+    including :py:class:`pyoslog.Handler`, is redirected to the capture. Recorded messages are indexed by log object
+    and type, so they can be queried without polling the system log store, and on platforms other than macOS.
+
+    A pytest fixture, ``oslog_capture``, that installs a new capture for the duration of a test is registered
+    automatically when pyoslog is installed."""
+
+    def __init__(self, enabled_types: Optional[List[int]] = None) -> None:
+        """:param enabled_types: The log types that :py:func:`pyoslog.os_log_type_enabled` should report as enabled.
+                              Messages of other types are discarded. Defaults to all types.
+        :type enabled_types: Optional[List[int]]
+        """
+        self.entries = []  # type: List[LogEntry]
+        self._enabled_types = set(_LOG_TYPES if enabled_types is None else enabled_types)
+        self._log_index = {}  # type: Dict[Tuple[Optional[str], Optional[str]], List[int]]
+        self._type_index = {}  # type: Dict[int, List[int]]
+        self._condition = threading.Condition()
+        self._previous_backend = None  # type: Any
+
+    def __enter__(self) -> 'LogCapture':
+        self.install()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.uninstall()
+
+    def install(self) -> None:
+        """Redirect all pyoslog output to this capture."""
+        self._previous_backend = core._backend
+        core._backend = self
+
+    def uninstall(self) -> None:
+        """Restore the backend that was in use before :py:func:`install` was called."""
+        if core._backend is self:
+            core._backend = self._previous_backend
+        self._previous_backend = None
+
+    def clear(self) -> None:
+        """Remove all recorded messages."""
+        with self._condition:
+            self.entries = []
+            self._log_index.clear()
+            self._type_index.clear()
+
+    # the methods below replace their _pyoslog equivalents while the capture is installed (see core.py)
+    @staticmethod
+    def os_log_create(subsystem: str, category: str) -> _CapturedLog:
+        # mirror the validation in _pyoslog.c so that behaviour is the same with and without a capture installed
+        if not isinstance(subsystem, str) or not isinstance(category, str):
+            raise TypeError('subsystem and category must be strings')
+        if not 0 < len(subsystem) < 250:
+            raise ValueError('subsystem string must not be empty, and must be less than 250 characters in length')
+        if not 0 < len(category) < 255:
+            raise ValueError('category string must not be empty, and must be less than 254 characters in length')
+        return _CapturedLog(subsystem, category)
+
+    def os_log_type_enabled(self, log_object: core.os_log_t, log_type: int) -> bool:
+        LogCapture._validate(log_object, log_type)
+        return log_object is not core.OS_LOG_DISABLED and log_type in self._enabled_types
+
+    def os_log_with_type(self, log_object: core.os_log_t, log_type: int, message: str) -> None:
+        if not self.os_log_type_enabled(log_object, log_type):
+            return
+
+        # noinspection PyProtectedMember
+        log_key = (log_object._subsystem, log_object._category)
+        with self._condition:
+            index = len(self.entries)
+            self.entries.append(LogEntry(log_key[0], log_key[1], log_type, message, time.time()))
+            self._log_index.setdefault(log_key, []).append(index)
+            self._type_index.setdefault(log_type, []).append(index)
+            self._condition.notify_all()
+
+    @staticmethod
+    def _validate(log_object: core.os_log_t, log_type: int) -> None:
+        if not isinstance(log_object, core.os_log_t):
+            raise TypeError('invalid log_object - must be pyoslog.OS_LOG_DEFAULT, pyoslog.OS_LOG_DISABLED, or an '
+                            'object initialised with pyoslog.os_log_create')
+        if isinstance(log_type, bool) or log_type not in _LOG_TYPES:
+            raise TypeError('invalid log_type - must be one of pyoslog.OS_LOG_TYPE_DEFAULT, pyoslog.OS_LOG_TYPE_INFO, '
+                            'pyoslog.OS_LOG_TYPE_DEBUG, pyoslog.OS_LOG_TYPE_ERROR or pyoslog.OS_LOG_TYPE_FAULT')
+
+    def _find(self, start: int, log_object: Optional[core.os_log_t], log_type: Optional[int],
+              pattern: Optional[Union[str, Pattern[str]]]) -> List[LogEntry]:
+        # start from the smallest matching index, then filter by the remaining criteria (caller must hold the lock)
+        candidates = None  # type: Optional[List[int]]
+        if log_object is not None:
+            # noinspection PyProtectedMember
+            candidates = self._log_index.get((log_object._subsystem, log_object._category), [])
+        if log_type is not None:
+            type_candidates = self._type_index.get(log_type, [])
+            if candidates is None or len(type_candidates) < len(candidates):
+                candidates = type_candidates
+
+        if candidates is None:
+            selected = self.entries[start:]
+        else:
+            selected = [self.entries[i] for i in candidates if i >= start]
+
+        if log_object is not None:
+            # noinspection PyProtectedMember
+            selected = [e for e in selected if (e.subsystem, e.category) == (log_object._subsystem,
+                                                                              log_object._category)]
+        if log_type is not None:
+            selected = [e for e in selected if e.type == log_type]
+        if pattern is not None:
+            regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+            selected = [e for e in selected if regex.search(e.message)]
+        return selected
+
+    def find(self, log_object: Optional[core.os_log_t] = None, log_type: Optional[int] = None,
+             pattern: Optional[Union[str, Pattern[str]]] = None) -> List[LogEntry]:
+        """Returns all recorded messages, in order, that match every one of the given criteria.
+
+        :param log_object: Only include messages sent to this log object (matched by subsystem and category).
+        :param log_type: Only include messages of this :py:const:`pyoslog.OS_LOG_TYPE_*` type.
+        :param pattern: Only include messages where this regular expression matches (via ``re.search``).
+        """
+        with self._condition:
+            return self._find(0, log_object, log_type, pattern)
+
+    def count(self, log_object: Optional[core.os_log_t] = None, log_type: Optional[int] = None,
+              pattern: Optional[Union[str, Pattern[str]]] = None) -> int:
+        """Returns the number of recorded messages that match the given criteria (see :py:func:`find`)."""
+        return len(self.find(log_object, log_type, pattern))
+
+    def last(self, log_object: Optional[core.os_log_t] = None, log_type: Optional[int] = None,
+             pattern: Optional[Union[str, Pattern[str]]] = None) -> Optional[LogEntry]:
+        """Returns the most recent message that matches the given criteria (see :py:func:`find`), or ``None``."""
+        matches = self.find(log_object, log_type, pattern)
+        return matches[-1] if matches else None
+
+    def wait_for(self, log_object: Optional[core.os_log_t] = None, log_type: Optional[int] = None,
+                 pattern: Optional[Union[str, Pattern[str]]] = None, count: int = 1,
+                 timeout: float = 1.0) -> List[LogEntry]:
+        """Waits until at least ``count`` recorded messages match the given criteria (see :py:func:`find`), and
+        returns them. Useful when messages are sent from other threads. If ``timeout`` seconds pass first, the matches
+        found so far (which may be an empty list) are returned."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            matches = self._find(0, log_object, log_type, pattern)
+            while len(matches) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                checked = len(self.entries)
+                self._condition.wait(remaining)
+                matches += self._find(checked, log_object, log_type, pattern)
+            return matches
@@ -1,5 +1,13 @@
+import contextlib
+import sys
+import traceback
 from ctypes import py_object
-from typing import Any
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+try:
+    import contextvars
+except ImportError:  # pragma: no cover
+    contextvars = None  # type: ignore  # python 3.6 - scope() is not available
 
 try:
     import _pyoslog  # type: ignore
@@ -7,11 +15,12 @@ except ImportError:  # pragma: no cover
     # noinspection PyPep8Naming
     class _pyoslog:  # type: ignore
         print('Warning: mocking _pyoslog class on an unsupported platform - use to build documentation only')
-        OS_LOG_TYPE_DEFAULT = 0
-        OS_LOG_TYPE_INFO = 0
-        OS_LOG_TYPE_DEBUG = 0
-        OS_LOG_TYPE_ERROR = 0
-        OS_LOG_TYPE_FAULT = 0
+        # values match os/log.h so that alternative backends (see capture.py) can distinguish between types
+        OS_LOG_TYPE_DEFAULT = 0x00
+        OS_LOG_TYPE_INFO = 0x01
+        OS_LOG_TYPE_DEBUG = 0x02
+        OS_LOG_TYPE_ERROR = 0x10
+        OS_LOG_TYPE_FAULT = 0x11
 
         @staticmethod
         def _get_os_log_default():
@@ -21,6 +30,18 @@ except ImportError:  # pragma: no cover
 _default_log = _pyoslog._get_os_log_default()
 _os_log_t_native_type = py_object
 
+# the platform truncates messages of 1024 characters or more (see _pyoslog.c)
+_MAX_MESSAGE_LENGTH = 1023
+
+# when set (e.g., by pyoslog.capture.LogCapture), messages are sent to this object instead of the native module
+_backend = None  # type: Any
+
+# when set (see accounting.py), a sample of calls is measured and attributed to the code that made them
+_accounting = None  # type: Any
+
+# when set (see packing.py), small messages are buffered and sent in batches as single entries
+_packer = None  # type: Any
+
 
 # noinspection PyPep8Naming
 class os_log_t:
@@ -40,6 +61,10 @@ OS_LOG_DEFAULT._description = '<os_log_t (OS_LOG_DEFAULT)>'
 OS_LOG_DISABLED = os_log_t(None, None, None)  # type: ignore
 OS_LOG_DISABLED._description = '<os_log_t (OS_LOG_DISABLED)>'
 
+# the log object used in place of OS_LOG_DEFAULT within the current scope() (if any) - see _resolve_log_object()
+_scoped_log = None if contextvars is None else contextvars.ContextVar('pyoslog_scoped_log', default=OS_LOG_DEFAULT)
+_scoped_log_cache = {}  # type: Dict[Tuple[str, str], Tuple[Any, os_log_t]]
+
 OS_LOG_TYPE_DEFAULT = _pyoslog.OS_LOG_TYPE_DEFAULT  # type: int
 OS_LOG_TYPE_INFO = _pyoslog.OS_LOG_TYPE_INFO  # type: int
 OS_LOG_TYPE_DEBUG = _pyoslog.OS_LOG_TYPE_DEBUG  # type: int
@@ -50,13 +75,46 @@ OS_LOG_TYPE_FAULT = _pyoslog.OS_LOG_TYPE_FAULT  # type: int
 def os_log_create(subsystem: str, category: str) -> os_log_t:
     """Creates a custom log object.
     See the `native method documentation <https://developer.apple.com/documentation/os/1643744-os_log_create>`_."""
+    if _backend is not None:
+        return os_log_t(_backend.os_log_create(subsystem, category), subsystem, category)
     # noinspection PyUnresolvedReferences
     return os_log_t(_pyoslog.os_log_create(subsystem, category), subsystem, category)
 
 
+def _resolve_log_object(log_object: os_log_t) -> os_log_t:
+    if log_object is OS_LOG_DEFAULT and _scoped_log is not None:
+        return _scoped_log.get()
+    return log_object
+
+
+@contextlib.contextmanager
+def scope(subsystem: str, category: str = 'default') -> Iterator[os_log_t]:
+    """A context manager that replaces :py:const:`pyoslog.OS_LOG_DEFAULT` with a custom log object within its context.
+    Any message that would be sent to :py:const:`pyoslog.OS_LOG_DEFAULT` (e.g., via :py:func:`log`, or a
+    :py:class:`Handler` without a subsystem) is instead sent to the log object for ``subsystem`` and ``category``.
+    Scopes can be nested, and are based on ``contextvars``, so each thread or asyncio task has its own scope.
+
+    Log objects are created once for each subsystem and category, then reused whenever the same scope is entered."""
+    if _scoped_log is None:  # pragma: no cover
+        raise NotImplementedError('pyoslog.scope() requires Python 3.7 or later')
+
+    cached_log = _scoped_log_cache.get((subsystem, category))
+    if cached_log is None or cached_log[0] is not _backend:  # log objects created by a backend only apply to it
+        cached_log = _scoped_log_cache[(subsystem, category)] = (_backend, os_log_create(subsystem, category))
+
+    token = _scoped_log.set(cached_log[1])
+    try:
+        yield cached_log[1]
+    finally:
+        _scoped_log.reset(token)
+
+
 def os_log_type_enabled(log_object: os_log_t, log_type: int) -> bool:
     """Returns a ``bool`` value that indicates whether the log can write messages with the specified log type. See the
     `native method documentation <https://developer.apple.com/documentation/os/1643749-os_log_type_enabled>`__."""
+    log_object = _resolve_log_object(log_object)
+    if _backend is not None:
+        return _backend.os_log_type_enabled(log_object, log_type)
     # noinspection PyProtectedMember,PyUnresolvedReferences
     return _pyoslog.os_log_type_enabled(log_object._log_object, log_type)
 
@@ -73,11 +131,53 @@ def os_log_debug_enabled(log_object: os_log_t) -> bool:
     return os_log_type_enabled(log_object, OS_LOG_TYPE_DEBUG)
 
 
-def os_log_with_type(log_object: os_log_t, log_type: int, *message: Any) -> None:
+def os_log_with_type(log_object: os_log_t, log_type: int, *message: Any,
+                     sinks: Optional[Sequence[Callable[[os_log_t, int, str], None]]] = None) -> None:
     """Sends a message at a specified level, such as default, info, debug, error or fault, to the logging system.
-    See the `native method documentation <https://developer.apple.com/documentation/os/os_log_with_type>`__."""
-    # noinspection PyProtectedMember,PyUnresolvedReferences
-    return _pyoslog.os_log_with_type(log_object._log_object, log_type, ' '.join(map(str, message)))
+    See the `native method documentation <https://developer.apple.com/documentation/os/os_log_with_type>`__.
+
+    If ``sinks`` are provided, the formatted message is also passed to each of them (see :py:mod:`pyoslog.sinks`) after
+    it has been logged, but only if ``log_type`` is enabled for ``log_object``. Exceptions raised by sinks are printed
+    to ``sys.stderr`` rather than raised, so a failing sink does not affect logging or other sinks."""
+    accounting = _accounting  # read once, as another thread may disable hotspots at any time
+    if accounting is not None and accounting.sample():
+        return accounting.measure(None, _os_log_with_type, log_object, log_type, ' '.join(map(str, message)), sinks)
+    return _os_log_with_type(log_object, log_type, ' '.join(map(str, message)), sinks)
+
+
+def _os_log_with_type(log_object: os_log_t, log_type: int, message: str,
+                      sinks: Optional[Sequence[Callable[[os_log_t, int, str], None]]]) -> None:
+    # the implementation of os_log_with_type() once the message is formatted (used internally to avoid accounting)
+    log_object = _resolve_log_object(log_object)
+    if _packer is not None and _packer.add(log_object, log_type, message):
+        pass
+    elif _backend is not None:
+        _backend.os_log_with_type(log_object, log_type, message)
+    else:
+        # noinspection PyProtectedMember,PyUnresolvedReferences
+        _pyoslog.os_log_with_type(log_object._log_object, log_type, message)
+
+    if sinks:
+        _send_to_sinks(log_object, log_type, message, sinks, _print_sink_error)
+    return None
+
+
+def _print_sink_error() -> None:
+    traceback.print_exc(file=sys.stderr)  # reported in the same way as by logging.Handler.handleError()
+
+
+def _send_to_sinks(log_object: os_log_t, log_type: int, message: str,
+                   sinks: Sequence[Callable[[os_log_t, int, str], None]], on_error: Callable[[], None]) -> None:
+    # sinks are called after the message has been sent to the unified log, and a failing sink (reported by calling
+    # on_error() from within the except block) neither prevents this nor affects other sinks
+    log_object = _resolve_log_object(log_object)
+    if not os_log_type_enabled(log_object, log_type):
+        return
+    for sink in sinks:
+        try:
+            sink(log_object, log_type, message)
+        except Exception:
+            on_error()
 
 
 def os_log(log_object: os_log_t, *message: Any) -> None:
@@ -0,0 +1,100 @@
+"""Sends the Python traceback to the unified log when the process crashes (e.g., due to a segmentation fault), in the
+same format as the standard library's ``faulthandler`` module. Handlers like :py:class:`pyoslog.Handler` cannot run
+safely when a fatal signal is received, so this module uses ``faulthandler`` to write the traceback of every thread to
+a pipe that is created in advance. A native signal handler then reads the pipe into a preallocated buffer and sends its
+contents as :py:const:`pyoslog.OS_LOG_TYPE_FAULT` messages, without allocating memory or needing the GIL.
+
+Enabling this module replaces any existing ``faulthandler.enable()`` configuration. To also write tracebacks to a file
+(such as ``sys.stderr``), pass it to :py:func:`enable`.
+
+The whole traceback is written to the pipe before it is read, so its length is limited by the pipe's capacity. Where
+possible (e.g., on Linux), the pipe is enlarged to 64KB, matching the native handler's buffer; on macOS, where pipes
+cannot be resized, it is 16KB, which is enough for about 200 frames. Anything beyond this is not logged, so for
+processes with many threads it may be worth passing ``all_threads=False``, or a ``file`` that receives the complete
+traceback."""
+import faulthandler as stdlib_faulthandler
+import fcntl
+import os
+from typing import Optional, TextIO, Tuple
+
+from . import core
+
+__all__ = ['enable', 'disable', 'is_enabled']
+
+_FAULT_BUFFER_SIZE = 65536  # the size of the native handler's buffer (see _pyoslog.c)
+
+_pipe = None  # type: Optional[Tuple[int, int]]
+# the file passed to enable(), kept so that its descriptor is not closed (and reused) while tracebacks are written to it
+_file = None  # type: Optional[TextIO]
+
+
+def enable(log_object: core.os_log_t = core.OS_LOG_DEFAULT, file: Optional[TextIO] = None,
+           all_threads: bool = True) -> None:
+    """Sends the traceback to ``log_object`` when the process receives a ``SIGSEGV``, ``SIGFPE``, ``SIGABRT``,
+    ``SIGBUS`` or ``SIGILL`` signal. Tracebacks longer than the maximum message length are split into several
+    messages, and those longer than the pipe's capacity are truncated (see :py:mod:`pyoslog.faulthandler`). Calling
+    this method again replaces the existing configuration.
+
+    :param log_object: The log object to send tracebacks to. A :py:func:`pyoslog.scope` that is active when this method
+                       is called is applied.
+    :type log_object: os_log_t = OS_LOG_DEFAULT
+    :param file: If provided, tracebacks are also written to this file (which must have a file descriptor).
+    :type file: Optional[TextIO]
+    :param all_threads: As for ``faulthandler.enable()``: if ``True``, the traceback of every thread is included;
+                        otherwise, only that of the thread that received the signal.
+    :type all_threads: bool = True
+    """
+    global _pipe, _file
+    if core._backend is not None:
+        raise RuntimeError('pyoslog.faulthandler sends messages from a native signal handler, so cannot be used while '
+                           'an alternative backend (such as a LogCapture) is installed')
+
+    disable()
+    stdlib_faulthandler.disable()  # our handler must be installed first, so that faulthandler calls it once finished
+
+    # both ends are non-blocking so that neither faulthandler nor our handler can wait forever while the process crashes
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    if hasattr(fcntl, 'F_SETPIPE_SZ'):  # Linux (python 3.10 or later) - see above for other platforms
+        try:
+            fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, _FAULT_BUFFER_SIZE)
+        except OSError:
+            pass  # e.g., if this exceeds /proc/sys/fs/pipe-max-size; the pipe's existing capacity is used instead
+
+    # noinspection PyProtectedMember
+    log_object = core._resolve_log_object(log_object)
+    try:
+        # noinspection PyProtectedMember,PyUnresolvedReferences
+        core._pyoslog._faulthandler_enable(log_object._log_object, read_fd, -1 if file is None else file.fileno())
+        stdlib_faulthandler.enable(file=write_fd, all_threads=all_threads)
+    except BaseException:
+        # noinspection PyProtectedMember,PyUnresolvedReferences
+        core._pyoslog._faulthandler_disable()
+        os.close(read_fd)
+        os.close(write_fd)
+        raise
+    _pipe = (read_fd, write_fd)
+    _file = file
+
+
+def disable() -> bool:
+    """Stops sending tracebacks to the unified log (and disables ``faulthandler``). Returns ``True`` if this module was
+    enabled, or ``False`` otherwise."""
+    global _pipe, _file
+    if _pipe is None:
+        return False
+
+    stdlib_faulthandler.disable()
+    # noinspection PyProtectedMember,PyUnresolvedReferences
+    core._pyoslog._faulthandler_disable()
+    for fd in _pipe:
+        os.close(fd)
+    _pipe = None
+    _file = None
+    return True
+
+
+def is_enabled() -> bool:
+    """Returns ``True`` if tracebacks are being sent to the unified log."""
+    return _pipe is not None
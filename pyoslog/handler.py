@@ -1,6 +1,8 @@
 import logging
-from typing import Optional
+import time
+from typing import Callable, List, Optional, Sequence
 
+from . import core as _core
 from .core import *
 
 # only the Handler itself should be visible when using `from handler import *`
@@ -17,7 +19,8 @@ class Handler(logging.Handler):
     The default output behaviour is to log to :py:const:`pyoslog.OS_LOG_DEFAULT`. This can be configured either by
     calling :py:func:`setSubsystem`, or by providing these arguments when creating a Handler instance."""
 
-    def __init__(self, subsystem: Optional[str] = None, category: str = 'default') -> None:
+    def __init__(self, subsystem: Optional[str] = None, category: str = 'default',
+                 sinks: Optional[Sequence[Callable[[os_log_t, int, str], None]]] = None) -> None:
         """If a subsystem is provided, a custom os_log object is created using that subsystem.
         If a category is also provided, it will be used; otherwise, ``'default'`` is used as the category name.
         If no subsystem is provided, :py:const:`pyoslog.OS_LOG_DEFAULT` is used, and the category parameter is ignored.
@@ -28,9 +31,13 @@ class Handler(logging.Handler):
         :param category: The category for os_log. Used only if subsystem is not ``None``. Defaults to ``'default'`` if
                          not provided.
         :type category: str = 'default'
+        :param sinks: Additional destinations (see :py:mod:`pyoslog.sinks`) that each formatted message is sent to,
+                      alongside the unified log. Messages are formatted only once, regardless of the number of sinks.
+        :type sinks: Optional[Sequence[Callable[[os_log_t, int, str], None]]]
         """
         logging.Handler.__init__(self)
         self._log_object = OS_LOG_DEFAULT
+        self._sinks = list(sinks) if sinks else []  # type: List[Callable[[os_log_t, int, str], None]]
         if subsystem is not None:
             self.setSubsystem(subsystem, category=category)
 
@@ -55,7 +62,41 @@ class Handler(logging.Handler):
         """Sets the subsystem (typically reverse DNS notation), and optionally a category to allow further filtering."""
         self._log_object = os_log_create(subsystem, category)
 
+    # noinspection PyPep8Naming
+    def addSink(self, sink: Callable[[os_log_t, int, str], None]) -> None:
+        """Adds an additional destination for this Handler's formatted messages (see :py:mod:`pyoslog.sinks`)."""
+        self._sinks.append(sink)
+
+    # noinspection PyPep8Naming
+    def removeSink(self, sink: Callable[[os_log_t, int, str], None]) -> None:
+        """Removes a destination previously added via :py:func:`addSink` or when creating the Handler."""
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a record, sending its contents to pyoslog at a matching level to our own. (note: excluded from built
         documentation as this method is not intended to be called directly.)"""
-        os_log_with_type(self._log_object, Handler._get_pyoslog_type(record.levelno), self.format(record))
+        try:
+            log_type = Handler._get_pyoslog_type(record.levelno)
+            # noinspection PyProtectedMember
+            accounting = _core._accounting
+            if accounting is not None and accounting.sample():
+                # the record already knows where it came from, so there is no need to search the stack; formatting
+                # time is included, as it is part of the cost of the logging call (see accounting.py)
+                start = time.perf_counter()
+                message = self.format(record)
+                # noinspection PyProtectedMember
+                accounting.measure((record.pathname, record.lineno, record.funcName), _core._os_log_with_type,
+                                   self._log_object, log_type, message, None, start=start)
+            else:
+                message = self.format(record)
+                # noinspection PyProtectedMember
+                _core._os_log_with_type(self._log_object, log_type, message, None)
+
+            if self._sinks:
+                # noinspection PyProtectedMember
+                _core._send_to_sinks(self._log_object, log_type, message, self._sinks, lambda: self.handleError(record))
+        except RecursionError:  # as in logging.StreamHandler.emit()
+            raise
+        except Exception:
+            self.handleError(record)
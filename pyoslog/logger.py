@@ -0,0 +1,156 @@
+import collections.abc
+import logging
+import sys
+import threading
+import traceback
+from typing import Any, Dict, Mapping, Optional
+
+from .core import *
+from .handler import Handler
+
+# only the Logger and getLogger() should be visible when using `from logger import *`
+__all__ = ['Logger', 'getLogger']
+
+_formatter = logging.Formatter()  # used only for its exception formatting, so that tracebacks match the logging module
+_error_handler = logging.Handler()  # used only to report formatting errors in the same way as the logging module
+_logger_class_lock = threading.Lock()
+
+
+class Logger(logging.Logger):
+    """A drop-in replacement for ``logging.Logger`` that sends messages straight to the unified log. Enabled messages
+    are formatted (``msg % args``, plus any exception traceback) and passed to :py:func:`pyoslog.os_log_with_type`
+    without creating a ``LogRecord``, finding the caller or running formatters, which are the bulk of the cost of the
+    standard logging path.
+
+    All the usual methods (``debug``, ``info``, ``warning``, ``error``, ``exception``, ``critical``, ``log``,
+    ``isEnabledFor``, ``setLevel``, etc.) work as normal, and levels are mapped to :py:const:`pyoslog.OS_LOG_TYPE_*`
+    types in the same way as :py:class:`Handler`. If handlers are attached to the logger (or to any logger it propagates
+    to), a ``LogRecord`` is still created for them - so there is no need to add a :py:class:`Handler` (doing so would
+    log each message twice). Similarly, if filters are added to the logger, every message takes the standard path (and
+    is sent to the unified log only if it passes them), so there is no speed-up for loggers with filters.
+
+    Create instances via :py:func:`getLogger`, or use ``logging.setLoggerClass(pyoslog.Logger)`` to make every logger
+    created afterwards a pyoslog Logger."""
+
+    def __init__(self, name: str, level: int = logging.NOTSET) -> None:
+        logging.Logger.__init__(self, name, level)
+        self.log_object = OS_LOG_DEFAULT
+        self._log_types = {}  # type: Dict[int, int]
+
+    # named to match logging class norms rather than PEP 8 recommendations
+    # noinspection PyPep8Naming
+    def setSubsystem(self, subsystem: str, category: Optional[str] = None) -> None:
+        """Sets the subsystem (typically reverse DNS notation) that messages are logged to, and optionally a category
+        (defaulting to the logger's name)."""
+        self.log_object = os_log_create(subsystem, self.name if category is None else category)
+
+    def _get_log_type(self, level: int) -> int:
+        log_type = self._log_types.get(level)
+        if log_type is None:
+            # noinspection PyProtectedMember
+            log_type = self._log_types[level] = Handler._get_pyoslog_type(level)
+        return log_type
+
+    def _log(self, level: int, msg: object, args: Any, exc_info: Any = None,
+             extra: Optional[Mapping[str, object]] = None, stack_info: bool = False, stacklevel: int = 1) -> None:
+        # every logging method calls this once isEnabledFor(level) (which is cached by the logging module) has passed
+        if self.filters:
+            # filters need (and may modify) a LogRecord, so the standard path is used instead - see handle()
+            self._standard_log(level, msg, args, exc_info, extra, stack_info, stacklevel + 1)
+            return
+
+        log_type = self._get_log_type(level)
+        if os_log_type_enabled(self.log_object, log_type):
+            # as in LogRecord.__init__() and getMessage() - args itself is passed unchanged to any handlers below
+            format_args = args
+            if args and len(args) == 1 and isinstance(args[0], collections.abc.Mapping) and args[0]:
+                format_args = args[0]
+            try:
+                message = str(msg) % format_args if format_args else str(msg)
+            except Exception:
+                # as when a handler fails to format a record: the message is not logged, and the error is reported
+                # (if logging.raiseExceptions is set) rather than raised
+                _error_handler.handleError(logging.LogRecord(self.name, level, '(unknown file)', 0, msg, args, None))
+            else:
+                if exc_info:
+                    if isinstance(exc_info, BaseException):
+                        exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+                    elif not isinstance(exc_info, tuple):
+                        exc_info = sys.exc_info()
+                    if exc_info[0] is not None:
+                        message += '\n' + _formatter.formatException(exc_info)
+                if stack_info:
+                    message += '\nStack (most recent call last):\n' + ''.join(traceback.format_stack()).rstrip('\n')
+                os_log_with_type(self.log_object, log_type, message)
+
+        if self.hasHandlers():
+            self._standard_log(level, msg, args, exc_info, extra, stack_info, stacklevel + 1)
+
+    def _standard_log(self, level: int, msg: object, args: Any, exc_info: Any, extra: Optional[Mapping[str, object]],
+                      stack_info: bool, stacklevel: int) -> None:
+        if sys.version_info >= (3, 8):
+            # one extra level, so that records are attributed to the caller rather than to this method
+            logging.Logger._log(self, level, msg, args, exc_info, extra, stack_info, stacklevel + 1)
+        else:  # pragma: no cover
+            logging.Logger._log(self, level, msg, args, exc_info, extra, stack_info)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """Passes a record to the logger's handlers, as for ``logging.Logger``. If the logger has filters, records that
+        pass them are also sent to the unified log. (note: excluded from built documentation as this method is not
+        intended to be called directly.)"""
+        if not self.filters:
+            logging.Logger.handle(self, record)  # messages are sent to the unified log by _log() instead
+            return
+
+        if self.disabled:
+            return
+        result = self.filter(record)  # type: Any
+        if not result:
+            return
+        if isinstance(result, logging.LogRecord):  # python 3.12 and later: filters may return a replacement record
+            record = result
+
+        log_type = self._get_log_type(record.levelno)
+        if os_log_type_enabled(self.log_object, log_type):
+            try:
+                message = _formatter.format(record)  # the message, plus any exception or stack information
+            except Exception:
+                _error_handler.handleError(record)
+            else:
+                os_log_with_type(self.log_object, log_type, message)
+        if self.hasHandlers():
+            self.callHandlers(record)
+
+
+# named to match the logging module rather than PEP 8 recommendations
+# noinspection PyPep8Naming
+def getLogger(name: str, subsystem: Optional[str] = None, category: Optional[str] = None) -> Logger:
+    """Returns the :py:class:`Logger` with the given name, creating it if needed. Unlike ``logging.setLoggerClass``,
+    this affects only the named logger, so can be used to speed up selected loggers (e.g., those of a high-volume
+    component) while leaving all other loggers unchanged. The logger is also registered with the logging module, so
+    subsequent calls to ``logging.getLogger(name)`` return the same object.
+
+    :param name: The logger's name, as for ``logging.getLogger``. A logger of a different class must not already exist
+                 with this name.
+    :type name: str
+    :param subsystem: If provided, messages are logged to a log object with this subsystem (see
+                      :py:func:`Logger.setSubsystem`) rather than :py:const:`pyoslog.OS_LOG_DEFAULT`.
+    :type subsystem: Optional[str]
+    :param category: The category for the log object. Used only if subsystem is not ``None``. Defaults to the logger's
+                     name.
+    :type category: Optional[str]
+    """
+    manager = logging.Logger.manager
+    with _logger_class_lock:
+        previous_class = manager.loggerClass
+        manager.loggerClass = Logger
+        try:
+            logger = logging.getLogger(name)
+        finally:
+            manager.loggerClass = previous_class
+
+    if not isinstance(logger, Logger):
+        raise ValueError('logger %r already exists, and is not a pyoslog.Logger' % name)
+    if subsystem is not None:
+        logger.setSubsystem(subsystem, category)
+    return logger
@@ -0,0 +1,230 @@
+"""Packing combines many small messages into fewer, larger entries in the unified log, reducing the per-message cost of
+high-rate logging. Once enabled (via :py:func:`enable_packing`), messages sent through any of pyoslog's methods
+(including :py:class:`pyoslog.Handler` and :py:class:`pyoslog.Logger`) are buffered for each log object, then sent as a
+single entry when the buffer's time window ends, when the next message would exceed the maximum entry length, or when a
+message of a different type is sent to the same log object. Error and fault messages are never buffered, and cause all
+buffers to be sent immediately. Buffers are also sent when the process exits.
+
+Entries that contain more than one message start with a ``pyoslog:packed:<count>`` line, followed by one line per
+message, oldest first, each starting with its time in milliseconds relative to when the entry was sent (e.g.,
+``-12.345 message``). :py:func:`unpack` splits an entry into its original messages, and the command line tool unpacks
+the output of ``log show --style ndjson`` (or ``log stream --style ndjson``)::
+
+    log show --style ndjson --predicate 'subsystem == "org.example.your-app"' | python -m pyoslog.packing
+"""
+import argparse
+import atexit
+import datetime
+import json
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from . import core
+
+__all__ = ['enable_packing', 'disable_packing', 'flush_packed_messages']
+
+_HEADER = 'pyoslog:packed:'
+_HEADER_LENGTH = len(_HEADER) + 3  # an entry can never hold more than 999 messages
+_MAX_OFFSET = 99999.999  # offsets are limited to this many milliseconds so that the space they need is known in advance
+_OFFSET_LENGTH = len('-%.3f ' % _MAX_OFFSET)
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f%z'  # as used by `log show --style ndjson`
+
+
+class _Buffer:
+    def __init__(self, log_type: int, deadline: float) -> None:
+        self.log_type = log_type
+        self.deadline = deadline
+        self.messages = []  # type: List[Tuple[float, str]]
+        self.length = _HEADER_LENGTH
+
+
+class _Packer:
+    def __init__(self, window: float, pack_types: Sequence[int]) -> None:
+        self.window = window
+        self.pack_types = frozenset(pack_types)
+        self.buffers = {}  # type: Dict[core.os_log_t, _Buffer]
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name='pyoslog-packing', daemon=True)
+        self.thread.start()
+
+    def add(self, log_object: core.os_log_t, log_type: int, message: str) -> bool:
+        # returns True if the message was buffered (or discarded), or False if the caller should send it directly; in
+        # the latter case, any earlier messages to the same log object have already been sent, so order is preserved
+        # the platform's limit applies to the UTF-8 encoded message, not to its number of characters
+        line_length = _OFFSET_LENGTH + len(message.encode('utf-8', 'surrogatepass')) + 1
+        packable = log_type in self.pack_types and '\n' not in message and \
+            _HEADER_LENGTH + line_length <= core._MAX_MESSAGE_LENGTH
+        if packable and not core.os_log_type_enabled(log_object, log_type):
+            return True  # no need to buffer messages that would not be logged
+
+        with self.condition:
+            if self.stopped:
+                return False
+            if log_type not in self.pack_types:
+                self._flush_all()
+                return False
+
+            buffer = self.buffers.get(log_object)
+            if buffer is not None and (not packable or buffer.log_type != log_type or
+                                       buffer.length + line_length > core._MAX_MESSAGE_LENGTH):
+                self._flush(log_object, buffer)
+                buffer = None
+            if not packable:
+                return False
+
+            now = time.monotonic()
+            if buffer is None:
+                buffer = self.buffers[log_object] = _Buffer(log_type, now + self.window)
+                self.condition.notify()
+            buffer.messages.append((now, message))
+            buffer.length += line_length
+            return True
+
+    def _flush(self, log_object: core.os_log_t, buffer: _Buffer) -> None:
+        # caller must hold the lock - messages are sent while holding it so that they stay in order
+        del self.buffers[log_object]
+        if len(buffer.messages) == 1:
+            message = buffer.messages[0][1]
+        else:
+            now = time.monotonic()
+            message = '\n'.join(['%s%d' % (_HEADER, len(buffer.messages))] +
+                                ['%.3f %s' % (max(1000 * (timestamp - now), -_MAX_OFFSET), text)
+                                 for timestamp, text in buffer.messages])
+
+        if core._backend is not None:
+            core._backend.os_log_with_type(log_object, buffer.log_type, message)
+        else:
+            # noinspection PyProtectedMember,PyUnresolvedReferences
+            core._pyoslog.os_log_with_type(log_object._log_object, buffer.log_type, message)
+
+    def _flush_all(self) -> None:
+        # caller must hold the lock
+        for log_object, buffer in list(self.buffers.items()):
+            self._flush(log_object, buffer)
+
+    def flush(self) -> None:
+        with self.condition:
+            self._flush_all()
+
+    def stop(self) -> None:
+        with self.condition:
+            self._flush_all()
+            self.stopped = True
+            self.condition.notify()
+
+    def _run(self) -> None:
+        with self.condition:
+            while not self.stopped:
+                now = time.monotonic()
+                for log_object, buffer in list(self.buffers.items()):
+                    if buffer.deadline <= now:
+                        self._flush(log_object, buffer)
+                next_deadline = min((buffer.deadline for buffer in self.buffers.values()), default=None)
+                self.condition.wait(None if next_deadline is None else next_deadline - now)
+
+
+def enable_packing(window: float = 0.05, pack_types: Optional[Sequence[int]] = None) -> None:
+    """Starts packing messages (see :py:mod:`pyoslog.packing`). Enabling again replaces the existing configuration,
+    sending any buffered messages first.
+
+    :param window: The maximum time in seconds that a message is buffered before being sent.
+    :type window: float = 0.05
+    :param pack_types: The log types to pack. Messages of any other type are sent immediately, after all buffered
+                       messages. Defaults to :py:const:`pyoslog.OS_LOG_TYPE_DEFAULT`,
+                       :py:const:`pyoslog.OS_LOG_TYPE_INFO` and :py:const:`pyoslog.OS_LOG_TYPE_DEBUG`.
+    :type pack_types: Optional[Sequence[int]]
+    """
+    if window <= 0:
+        raise ValueError('window must be greater than 0')
+    disable_packing()
+    core._packer = _Packer(window, (core.OS_LOG_TYPE_DEFAULT, core.OS_LOG_TYPE_INFO, core.OS_LOG_TYPE_DEBUG)
+                           if pack_types is None else pack_types)
+
+
+def disable_packing() -> None:
+    """Sends any buffered messages, then stops packing."""
+    packer = core._packer
+    if packer is not None:
+        core._packer = None
+        packer.stop()
+
+
+def flush_packed_messages() -> None:
+    """Sends any buffered messages immediately (e.g., before forking). This happens automatically when the process
+    exits."""
+    packer = core._packer
+    if packer is not None:
+        packer.flush()
+
+
+atexit.register(flush_packed_messages)
+
+
+def unpack(message: str, timestamp: float = 0.0) -> List[Tuple[float, str]]:
+    """Splits an entry into the messages it contains, returning a list of ``(timestamp, message)`` tuples, oldest first.
+    Entries that were not packed are returned as a single message.
+
+    :param message: The entry's message.
+    :type message: str
+    :param timestamp: The time the entry was logged. The returned timestamps are relative to this value.
+    :type timestamp: float = 0.0
+    """
+    lines = message.split('\n')
+    if len(lines) > 2 and lines[0] == '%s%d' % (_HEADER, len(lines) - 1):
+        try:
+            messages = []
+            for line in lines[1:]:
+                offset, text = line.split(' ', 1)
+                messages.append((timestamp + float(offset) / 1000, text))
+            return messages
+        except ValueError:
+            pass
+    return [(timestamp, message)]
+
+
+def unpack_ndjson(lines: Iterable[str], output: TextIO) -> int:
+    """Reads the newline-delimited JSON output of ``log show --style ndjson`` (or ``log stream``) from ``lines``, and
+    writes it to ``output`` with each packed entry replaced by one object per message, with adjusted timestamps. Lines
+    that are not JSON objects are copied unchanged. Returns the number of messages written."""
+    count = 0
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            message = entry['eventMessage']
+        except (ValueError, TypeError, KeyError):
+            output.write(line if line.endswith('\n') else line + '\n')
+            continue
+
+        try:
+            timestamp = datetime.datetime.strptime(entry['timestamp'], _TIMESTAMP_FORMAT)
+        except (KeyError, TypeError, ValueError):
+            timestamp = None
+        for offset, text in unpack(message):
+            unpacked_entry = dict(entry, eventMessage=text)
+            if timestamp is not None:
+                unpacked_entry['timestamp'] = (timestamp + datetime.timedelta(seconds=offset)).strftime(
+                    _TIMESTAMP_FORMAT)
+            output.write(json.dumps(unpacked_entry) + '\n')
+            count += 1
+    return count
+
+
+def _main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m pyoslog.packing',
+                                     description='Unpack packed pyoslog entries in the output of `log show --style '
+                                                 'ndjson` or `log stream --style ndjson`')
+    parser.add_argument('input', nargs='?', help='the file to read from (default: standard input)')
+    parsed_arguments = parser.parse_args(arguments)
+
+    if parsed_arguments.input:
+        with open(parsed_arguments.input) as input_file:
+            unpack_ndjson(input_file, sys.stdout)
+    else:
+        unpack_ndjson(sys.stdin, sys.stdout)
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,19 @@
+from typing import Any, Iterator
+
+import pytest
+
+
+@pytest.fixture
+def oslog_capture() -> Iterator[Any]:
+    """Installs a :py:class:`pyoslog.capture.LogCapture` for the duration of a test, so that messages sent via pyoslog
+    can be checked without reading from the unified log. For example::
+
+        def test_warning(oslog_capture):
+            run_code_under_test()
+            assert oslog_capture.last(log_type=pyoslog.OS_LOG_TYPE_ERROR).message == 'expected message'
+    """
+    # imported here rather than at module level so that pytest runs that never use the fixture are unaffected
+    from .capture import LogCapture
+
+    with LogCapture() as capture:
+        yield capture
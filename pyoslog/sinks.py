@@ -0,0 +1,170 @@
+"""Additional destinations for pyoslog messages. A sink is any callable that accepts the log object, log type and
+formatted message string, and can be passed to :py:func:`pyoslog.os_log_with_type` or :py:class:`pyoslog.Handler`."""
+import datetime
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, List, Optional
+
+from .core import *
+
+Sink = Callable[[os_log_t, int, str], None]
+
+_TYPE_NAMES = {OS_LOG_TYPE_DEFAULT: 'Default', OS_LOG_TYPE_INFO: 'Info', OS_LOG_TYPE_DEBUG: 'Debug',
+               OS_LOG_TYPE_ERROR: 'Error', OS_LOG_TYPE_FAULT: 'Fault'}
+
+
+def _map_file(path: str, size: int) -> mmap.mmap:
+    # open (or create) a file of exactly `size` bytes and map it into memory so that writes need no system calls
+    descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(descriptor).st_size != size:
+            os.ftruncate(descriptor, size)
+        return mmap.mmap(descriptor, size)
+    finally:
+        os.close(descriptor)  # the mapping keeps its own reference to the file
+
+
+class RingBufferSink:
+    """A sink that writes messages as lines of text to a fixed-size, memory-mapped file. When the file is full, the
+    oldest messages are overwritten, so the file always holds the most recent output (e.g., for inclusion in crash
+    reports). Writes are made directly to the mapped memory, so no system calls are needed per message, and the
+    contents survive the process exiting unexpectedly. Use :py:func:`read` to retrieve the stored lines in order."""
+
+    _MAGIC = b'PYOSRING'
+    _HEADER = struct.Struct('<8sQQ')  # magic, data capacity, next write offset
+
+    def __init__(self, path: str, size: int = 1024 * 1024) -> None:
+        """:param path: The file to write to. An existing ring buffer file of the same size is appended to; any other
+                     file at this path is replaced.
+        :type path: str
+        :param size: The total size of the file in bytes.
+        :type size: int = 1048576
+        """
+        capacity = size - RingBufferSink._HEADER.size
+        if capacity <= 0:
+            raise ValueError('size must be greater than %d bytes' % RingBufferSink._HEADER.size)
+
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._map = _map_file(path, size)
+
+        magic, stored_capacity, offset = RingBufferSink._HEADER.unpack_from(self._map)
+        if magic != RingBufferSink._MAGIC or stored_capacity != capacity or offset >= capacity:
+            self._map[:] = bytes(size)
+            offset = 0
+        self._offset = offset
+        RingBufferSink._HEADER.pack_into(self._map, 0, RingBufferSink._MAGIC, capacity, offset)
+
+    def __call__(self, log_object: os_log_t, log_type: int, message: str) -> None:
+        line = '%s %s %s %s\n' % (datetime.datetime.now().isoformat(), log_object, _TYPE_NAMES.get(log_type, log_type),
+                                  message)
+        data = line.encode('utf-8', 'replace')[-self._capacity:]
+        header_size = RingBufferSink._HEADER.size
+        with self._lock:
+            if self._map.closed:
+                return
+            start = self._offset
+            first = min(len(data), self._capacity - start)
+            self._map[header_size + start:header_size + start + first] = data[:first]
+            if first < len(data):
+                self._map[header_size:header_size + len(data) - first] = data[first:]
+            self._offset = (start + len(data)) % self._capacity
+            struct.pack_into('<Q', self._map, 16, self._offset)  # after the header's magic and capacity fields
+
+    def close(self) -> None:
+        """Flush the mapped file to disk and close it."""
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+
+    @staticmethod
+    def read(path: str) -> List[str]:
+        """Returns the complete lines stored in the ring buffer file at ``path``, oldest first."""
+        with open(path, 'rb') as ring_file:
+            contents = ring_file.read()
+        magic, capacity, offset = RingBufferSink._HEADER.unpack_from(contents)
+        if magic != RingBufferSink._MAGIC:
+            raise ValueError('%s is not a pyoslog ring buffer file' % path)
+
+        data = contents[RingBufferSink._HEADER.size:RingBufferSink._HEADER.size + capacity]
+        data = (data[offset:] + data[:offset]).lstrip(b'\0')  # unused space is zero-filled
+        lines = data.decode('utf-8', 'replace').split('\n')[:-1]
+        if len(data) == capacity:
+            lines = lines[1:]  # the buffer has wrapped, so the oldest line is likely to be incomplete
+        return lines
+
+
+class ThreadedSink:
+    """Wraps another sink so that it runs on a background thread, ensuring that slow sinks (e.g., network or disk
+    writes) do not add latency to logging calls. If the wrapped sink cannot keep up and the queue fills, further
+    messages are passed to ``overflow`` (e.g., a :py:class:`pyoslog.spool.Spool`), or, if there is no overflow sink,
+    discarded (and counted in :py:attr:`dropped`), rather than blocking the caller. The same applies to messages sent
+    after the sink has been closed."""
+
+    def __init__(self, sink: Sink, max_queue_size: int = 10000, overflow: Optional[Sink] = None) -> None:
+        """:param sink: The sink to run on the background thread.
+        :type sink: Callable[[os_log_t, int, str], None]
+        :param max_queue_size: The maximum number of messages waiting to be processed.
+        :type max_queue_size: int = 10000
+        :param overflow: A fast sink to receive messages that do not fit in the queue. Called on the logging thread.
+        :type overflow: Optional[Callable[[os_log_t, int, str], None]]
+        """
+        self.sink = sink
+        self.overflow = overflow
+        self.dropped = 0
+        self._closed = False
+        self._queue = queue.Queue(max_queue_size)  # type: queue.Queue
+        self._thread = threading.Thread(target=self._run, name='pyoslog-sink', daemon=True)
+        self._thread.start()
+
+    def __call__(self, log_object: os_log_t, log_type: int, message: str) -> None:
+        try:
+            if self._closed:
+                raise queue.Full  # nothing would ever read the message from the queue
+            self._queue.put_nowait((log_object, log_type, message))
+        except queue.Full:
+            if self.overflow is not None:
+                self.overflow(log_object, log_type, message)
+            else:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.sink(*item)
+            except Exception:  # a failing sink should not stop others - report in the same way as logging.Handler
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all queued messages have been passed to the wrapped sink, or until ``timeout`` seconds have
+        passed. Returns ``True`` if the queue was emptied."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # noinspection PyUnresolvedReferences
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Processes any remaining messages, then stops the background thread (and closes the wrapped sink, if
+        possible). Any messages sent afterwards are passed to ``overflow`` (or discarded)."""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        close = getattr(self.sink, 'close', None)  # type: Any
+        if close is not None:
+            close()
@@ -0,0 +1,261 @@
+"""A durable, fixed-size spool for messages that cannot (or should not) be logged immediately, such as those that
+overflow a :py:class:`pyoslog.sinks.ThreadedSink` queue. Messages are stored as compact binary records in a
+memory-mapped file, so they survive the process crashing, and can later be replayed to the unified log or exported as
+newline-delimited JSON, either via the methods below or from the command line::
+
+    python -m pyoslog.spool replay /path/to/spool [--clear]
+    python -m pyoslog.spool export /path/to/spool [--output messages.ndjson]
+"""
+import argparse
+import json
+import mmap
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+from .capture import LogEntry
+from .core import *
+from .sinks import _TYPE_NAMES, _map_file
+
+__all__ = ['Spool', 'read', 'replay', 'export_ndjson']
+
+_FILE_MAGIC = b'PYOSSPL1'
+_FILE_HEADER = struct.Struct('<8sQQQQH')  # magic, table size, data capacity, next write offset, next sequence, names
+_FILE_HEADER_SIZE = 64  # _FILE_HEADER.size, rounded up to leave space for future fields
+_HEAD_OFFSET = 24  # the position of the write offset field, which is updated (along with the sequence) on every write
+
+_NAME_ENTRY = struct.Struct('<H')  # length of the following 'subsystem\0category' string
+
+# records are: magic, crc32 of the rest of the record, message length, sequence, timestamp, log object ID, log type,
+# then the message itself (the checksummed body starts at the message length)
+_RECORD_MAGIC = b'PYSR'
+_RECORD_HEADER = struct.Struct('<4sIIQdHB')
+_RECORD_BODY = struct.Struct('<IQdHB')
+
+_DEFAULT_LOG_ID = 0  # OS_LOG_DEFAULT (and OS_LOG_DISABLED, though its messages are never spooled)
+_INLINE_LOG_ID = 0xFFFF  # the name table is full - the subsystem and category precede the message instead
+
+
+class Spool:
+    """A sink that stores messages in a ring of binary records in a memory-mapped file. Each record holds the message's
+    timestamp, log object, type and text. Log objects are stored once, in a table at the start of the file, and
+    referenced by ID. When the file is full, the oldest records are overwritten.
+
+    Writes only copy data into mapped memory, so there are no system calls per message, and each record is
+    checksummed, so any that were partially written when a process crashed are ignored when reading."""
+
+    def __init__(self, path: str, size: int = 4 * 1024 * 1024, table_size: int = 16 * 1024) -> None:
+        """:param path: The spool file. An existing spool of the same size is appended to; any other file at this path
+                     is replaced.
+        :type path: str
+        :param size: The total size of the file in bytes.
+        :type size: int = 4194304
+        :param table_size: The space in bytes reserved for the names of log objects. If this is exhausted, the names of
+                           further log objects are stored with each of their messages.
+        :type table_size: int = 16384
+        """
+        capacity = size - _FILE_HEADER_SIZE - table_size
+        if capacity <= _RECORD_HEADER.size:
+            raise ValueError('size must be greater than %d bytes' % (_FILE_HEADER_SIZE + table_size +
+                                                                     _RECORD_HEADER.size))
+
+        self._lock = threading.Lock()
+        self._map = _map_file(path, size)
+
+        magic, stored_table_size, stored_capacity, head, sequence, name_count = _FILE_HEADER.unpack_from(self._map)
+        if magic != _FILE_MAGIC or _FILE_HEADER_SIZE + stored_table_size + stored_capacity != size or \
+                head > stored_capacity:
+            self._map[:] = bytes(size)
+            stored_table_size, stored_capacity, head, sequence, name_count = table_size, capacity, 0, 0, 0
+            _FILE_HEADER.pack_into(self._map, 0, _FILE_MAGIC, table_size, capacity, 0, 0, 0)
+
+        self._table_size = stored_table_size
+        self._capacity = stored_capacity
+        self._data_start = _FILE_HEADER_SIZE + stored_table_size
+        self._head = head
+        self._sequence = sequence
+        self._names = _read_names(self._map, name_count)
+        self._table_end = _FILE_HEADER_SIZE + sum(_NAME_ENTRY.size + len(('%s\0%s' % name).encode('utf-8'))
+                                                  for name in self._names)
+        self._log_ids = {name: i + 1 for i, name in enumerate(self._names)}  # type: Dict[Tuple[str, str], int]
+
+    def __call__(self, log_object: os_log_t, log_type: int, message: str) -> None:
+        timestamp = time.time()
+        # noinspection PyProtectedMember
+        subsystem, category = log_object._subsystem, log_object._category
+        data = message.encode('utf-8', 'replace')
+        with self._lock:
+            if self._map.closed:
+                return
+            log_id = _DEFAULT_LOG_ID if subsystem is None else self._get_log_id(subsystem, category)
+            if log_id == _INLINE_LOG_ID:
+                data = ('%s\0%s\0' % (subsystem, category)).encode('utf-8') + data
+            data = data[:self._capacity - _RECORD_HEADER.size]
+
+            record_length = _RECORD_HEADER.size + len(data)
+            if self._head + record_length > self._capacity:
+                self._head = 0  # any (intact) records that remain at the end are still valid, and are read as normal
+
+            body = _RECORD_BODY.pack(len(data), self._sequence, timestamp, log_id, log_type) + data
+            start = self._data_start + self._head
+            self._map[start:start + record_length] = _RECORD_MAGIC + struct.pack('<I', zlib.crc32(body)) + body
+            self._head += record_length
+            self._sequence += 1
+            struct.pack_into('<QQ', self._map, _HEAD_OFFSET, self._head, self._sequence)
+
+    def _get_log_id(self, subsystem: str, category: str) -> int:
+        # caller must hold the lock
+        log_id = self._log_ids.get((subsystem, category))
+        if log_id is not None:
+            return log_id
+
+        entry = ('%s\0%s' % (subsystem, category)).encode('utf-8')
+        if self._table_end + _NAME_ENTRY.size + len(entry) > self._data_start or \
+                len(self._names) + 1 >= _INLINE_LOG_ID:
+            return _INLINE_LOG_ID
+
+        _NAME_ENTRY.pack_into(self._map, self._table_end, len(entry))
+        self._map[self._table_end + _NAME_ENTRY.size:self._table_end + _NAME_ENTRY.size + len(entry)] = entry
+        self._table_end += _NAME_ENTRY.size + len(entry)
+        self._names.append((subsystem, category))
+        log_id = self._log_ids[(subsystem, category)] = len(self._names)
+        struct.pack_into('<H', self._map, _FILE_HEADER.size - 2, len(self._names))  # the header's final field
+        return log_id
+
+    def clear(self) -> None:
+        """Removes all stored messages (e.g., after replaying them). Sequence numbers and log object IDs are kept."""
+        with self._lock:
+            self._map[self._data_start:self._data_start + self._capacity] = bytes(self._capacity)
+            self._head = 0
+            struct.pack_into('<Q', self._map, _HEAD_OFFSET, 0)
+
+    def close(self) -> None:
+        """Flush the mapped file to disk and close it."""
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+
+
+def _read_names(contents: Union[bytes, mmap.mmap], name_count: int) -> List[Tuple[str, str]]:
+    names = []
+    position = _FILE_HEADER_SIZE
+    for _ in range(name_count):
+        length, = _NAME_ENTRY.unpack_from(contents, position)
+        position += _NAME_ENTRY.size
+        subsystem, category = bytes(contents[position:position + length]).decode('utf-8').split('\0', 1)
+        names.append((subsystem, category))
+        position += length
+    return names
+
+
+def read(path: str) -> List[LogEntry]:
+    """Returns all intact messages stored in the spool file at ``path``, oldest first."""
+    with open(path, 'rb') as spool_file:
+        contents = spool_file.read()
+    return [entry for _, _, entry in _read_records(path, contents)]
+
+
+def _read_records(path: str, contents: Union[bytes, mmap.mmap]) -> List[Tuple[int, int, LogEntry]]:
+    # returns the sequence number, position in the file and contents of every intact record, oldest first
+    magic, table_size, capacity, _, _, name_count = _FILE_HEADER.unpack_from(contents)
+    if magic != _FILE_MAGIC:
+        raise ValueError('%s is not a pyoslog spool file' % path)
+    names = _read_names(contents, name_count)
+    data_start = _FILE_HEADER_SIZE + table_size
+    data = contents[data_start:data_start + capacity]
+
+    # records may have been partially overwritten, so rather than following offsets we look for every valid record
+    records = []
+    position = data.find(_RECORD_MAGIC)
+    while 0 <= position <= len(data) - _RECORD_HEADER.size:
+        _, crc, length, sequence, timestamp, log_id, log_type = _RECORD_HEADER.unpack_from(data, position)
+        end = position + _RECORD_HEADER.size + length
+        if end <= len(data) and zlib.crc32(data[position + 8:end]) == crc:
+            message = data[position + _RECORD_HEADER.size:end].decode('utf-8', 'replace')
+            subsystem = category = None  # type: Optional[str]
+            if log_id == _INLINE_LOG_ID:
+                subsystem, category, message = message.split('\0', 2)
+            elif log_id != _DEFAULT_LOG_ID and log_id <= len(names):
+                subsystem, category = names[log_id - 1]
+            records.append((sequence, data_start + position, LogEntry(subsystem, category, log_type, message,
+                                                                      timestamp)))
+            position = data.find(_RECORD_MAGIC, end)
+        else:
+            position = data.find(_RECORD_MAGIC, position + 1)
+
+    records.sort(key=lambda record: record[0])
+    return records
+
+
+def replay(path: str, clear: bool = False) -> int:
+    """Sends every message stored in the spool file at ``path`` to the unified log (via
+    :py:func:`pyoslog.os_log_with_type`), oldest first, and returns the number of messages sent. Note that the unified
+    log records the time of replay rather than the original time; use :py:func:`export_ndjson` if this is important.
+
+    If ``clear`` is ``True``, each message is removed from the spool as soon as it has been sent. Only the messages that
+    are replayed are removed, so any that are stored while replaying (e.g., by another process) are kept."""
+    log_objects = {}  # type: Dict[Tuple[str, str], os_log_t]
+    with open(path, 'r+b' if clear else 'rb') as spool_file:
+        contents = mmap.mmap(spool_file.fileno(), 0, access=mmap.ACCESS_WRITE if clear else mmap.ACCESS_READ)
+        try:
+            records = _read_records(path, contents)
+            for sequence, position, entry in records:
+                log_object = OS_LOG_DEFAULT
+                if entry.subsystem is not None and entry.category is not None:
+                    cached_log = log_objects.get((entry.subsystem, entry.category))
+                    if cached_log is None:
+                        cached_log = log_objects[(entry.subsystem, entry.category)] = os_log_create(entry.subsystem,
+                                                                                                    entry.category)
+                    log_object = cached_log
+                os_log_with_type(log_object, entry.type, entry.message)
+
+                if clear:
+                    # only this record is invalidated (rather than the whole spool being zeroed), and only if it has
+                    # not already been overwritten by a newer one
+                    magic, _, _, current_sequence, _, _, _ = _RECORD_HEADER.unpack_from(contents, position)
+                    if magic == _RECORD_MAGIC and current_sequence == sequence:
+                        contents[position:position + len(_RECORD_MAGIC)] = bytes(len(_RECORD_MAGIC))
+        finally:
+            contents.close()
+    return len(records)
+
+
+def export_ndjson(path: str, output: TextIO) -> int:
+    """Writes every message stored in the spool file at ``path`` to ``output`` as newline-delimited JSON objects, oldest
+    first, and returns the number of messages written."""
+    entries = read(path)
+    for entry in entries:
+        output.write(json.dumps({'timestamp': entry.timestamp, 'subsystem': entry.subsystem,
+                                 'category': entry.category, 'type': _TYPE_NAMES.get(entry.type, entry.type),
+                                 'message': entry.message}) + '\n')
+    return len(entries)
+
+
+def _main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m pyoslog.spool', description='Replay or export a pyoslog spool')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    replay_parser = subparsers.add_parser('replay', help='send stored messages to the unified log')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--clear', action='store_true', help='remove messages from the spool once sent')
+    export_parser = subparsers.add_parser('export', help='write stored messages as newline-delimited JSON')
+    export_parser.add_argument('path')
+    export_parser.add_argument('--output', help='the file to write to (default: standard output)')
+    parsed_arguments = parser.parse_args(arguments)
+
+    if parsed_arguments.command == 'replay':
+        count = replay(parsed_arguments.path, parsed_arguments.clear)
+        print('Replayed %d messages from %s' % (count, parsed_arguments.path), file=sys.stderr)
+    elif parsed_arguments.output:
+        with open(parsed_arguments.output, 'w') as output_file:
+            export_ndjson(parsed_arguments.path, output_file)
+    else:
+        export_ndjson(parsed_arguments.path, sys.stdout)
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,205 @@
+import contextlib
+import io
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .core import *
+from .core import _MAX_MESSAGE_LENGTH
+
+try:
+    import contextvars
+except ImportError:  # pragma: no cover
+    contextvars = None  # type: ignore  # python 3.6
+
+# only the Stream and redirection helpers should be visible when using `from stream import *`
+__all__ = ['Stream', 'redirect_stdout', 'redirect_stderr']
+
+
+class _Flusher:
+    # a single thread that sends the partial lines of every Stream once their flush_interval has passed, so that writing
+    # a partial line (as print() does before writing its line ending) only needs to record a deadline
+    def __init__(self) -> None:
+        self.pending = {}  # type: Dict[Stream, Tuple[float, Callable[[Callable[[], None]], None]]]
+        self.condition = threading.Condition()
+        self.next_deadline = None  # type: Optional[float]
+        self.thread = None  # type: Optional[threading.Thread]
+
+    def schedule(self, stream: 'Stream', deadline: float) -> None:
+        # run in a copy of the writer's context so that partial lines are sent within the same pyoslog.scope()
+        context_run = contextvars.copy_context().run if contextvars is not None else lambda f: f()
+        with self.condition:
+            self.pending[stream] = (deadline, context_run)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='pyoslog-stream', daemon=True)
+                self.thread.start()
+            elif self.next_deadline is None or deadline < self.next_deadline:
+                self.condition.notify()  # otherwise, the thread will wake up in time anyway
+
+    def cancel(self, stream: 'Stream') -> None:
+        with self.condition:
+            self.pending.pop(stream, None)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                now = time.monotonic()
+                due = [(stream, context_run) for stream, (deadline, context_run) in self.pending.items()
+                       if deadline <= now]
+                for stream, _ in due:
+                    del self.pending[stream]
+                if not due:
+                    self.next_deadline = min((deadline for deadline, _ in self.pending.values()), default=None)
+                    self.condition.wait(None if self.next_deadline is None else self.next_deadline - now)
+                    continue
+
+            # streams are flushed without holding the condition, as writers hold their stream's lock when scheduling
+            for stream, context_run in due:
+                context_run(stream._flush_from_timer)
+
+
+_flusher = _Flusher()
+
+
+class Stream(io.TextIOBase):
+    """A writable text stream that sends its contents to pyoslog, for use with code that writes to files or
+    ``sys.stdout`` / ``sys.stderr`` rather than using a logging method (see :py:func:`redirect_stdout`).
+
+    Output is line buffered: each complete line is sent as soon as it is written, and lines that are written together
+    (e.g., via :py:func:`writelines`) are combined into as few log messages as possible, without exceeding the
+    platform's maximum message length (about 1024 characters). Partial lines are sent when :py:func:`flush` is called,
+    when they reach the maximum length, or after ``flush_interval`` seconds, whichever is first."""
+
+    def __init__(self, log_object: os_log_t = OS_LOG_DEFAULT, log_type: int = OS_LOG_TYPE_DEFAULT,
+                 flush_interval: Optional[float] = 1.0) -> None:
+        """:param log_object: The log object to send messages to.
+        :type log_object: os_log_t = OS_LOG_DEFAULT
+        :param log_type: The :py:const:`pyoslog.OS_LOG_TYPE_*` type to use for messages.
+        :type log_type: int = OS_LOG_TYPE_DEFAULT
+        :param flush_interval: The maximum time in seconds that a partial line waits before being sent. If ``None``,
+                               partial lines are only sent when the stream is flushed or closed.
+        :type flush_interval: Optional[float] = 1.0
+        """
+        io.TextIOBase.__init__(self)
+        self.log_object = log_object
+        self.log_type = log_type
+        self.flush_interval = flush_interval
+        self._buffer = []  # type: List[str]
+        self._lock = threading.RLock()
+        self._flush_deadline = None  # type: Optional[float]
+
+    @property
+    def encoding(self) -> str:  # type: ignore
+        return 'utf-8'
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if self.closed:
+            raise ValueError('I/O operation on closed stream')
+        if not isinstance(text, str):
+            raise TypeError('write() argument must be str, not %s' % type(text).__name__)
+        if text:
+            with self._lock:
+                self._buffer.append(text)
+                self._send(final=False)
+        return len(text)
+
+    def writelines(self, lines: Iterable[str]) -> None:  # type: ignore
+        # unlike the default implementation, this checks the buffer once rather than after every line
+        if self.closed:
+            raise ValueError('I/O operation on closed stream')
+        with self._lock:
+            self._buffer.extend(lines)
+            self._send(final=False)
+
+    def flush(self) -> None:
+        """Sends all buffered text, including any partial line."""
+        with self._lock:
+            self._send(final=True)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.flush()
+        io.TextIOBase.close(self)
+
+    def _send(self, final: bool) -> None:
+        # caller must hold the lock
+        pending = ''.join(self._buffer)
+        self._buffer = []
+        if final:
+            complete, partial = pending[:-1] if pending.endswith('\n') else pending, ''
+            has_complete = bool(pending)
+        else:
+            complete, separator, partial = pending.rpartition('\n')
+            has_complete = bool(separator)
+
+        if has_complete:
+            self._log_lines(complete.split('\n'))
+        while len(partial) >= _MAX_MESSAGE_LENGTH:  # partial lines are sent once they reach the maximum length
+            self._log(partial[:_MAX_MESSAGE_LENGTH])
+            partial = partial[_MAX_MESSAGE_LENGTH:]
+
+        if partial:
+            self._buffer.append(partial)
+            if self._flush_deadline is None and self.flush_interval is not None:
+                self._flush_deadline = time.monotonic() + self.flush_interval
+                _flusher.schedule(self, self._flush_deadline)
+        elif self._flush_deadline is not None:
+            self._flush_deadline = None
+            _flusher.cancel(self)
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._flush_deadline = None
+            if not self.closed:
+                self._send(final=True)
+
+    def _log_lines(self, lines: List[str]) -> None:
+        # combine lines into as few messages as possible, splitting only those that are too long for a single message
+        message = []  # type: List[str]
+        message_length = -1  # account for the separator that is not needed before the first line
+        for line in lines:
+            while len(line) > _MAX_MESSAGE_LENGTH:
+                self._log('\n'.join(message))
+                message, message_length = [], -1
+                self._log(line[:_MAX_MESSAGE_LENGTH])
+                line = line[_MAX_MESSAGE_LENGTH:]
+            if message_length + 1 + len(line) > _MAX_MESSAGE_LENGTH:
+                self._log('\n'.join(message))
+                message, message_length = [], -1
+            message.append(line)
+            message_length += 1 + len(line)
+        self._log('\n'.join(message))
+
+    def _log(self, message: str) -> None:
+        if message:
+            os_log_with_type(self.log_object, self.log_type, message)
+
+
+@contextlib.contextmanager
+def _redirect(stream_name: str, log_object: os_log_t, log_type: int, flush_interval: Optional[float]) -> Iterator[Any]:
+    stream = Stream(log_object, log_type, flush_interval)
+    original_stream = getattr(sys, stream_name)
+    setattr(sys, stream_name, stream)
+    try:
+        yield stream
+    finally:
+        setattr(sys, stream_name, original_stream)
+        stream.close()
+
+
+def redirect_stdout(log_object: os_log_t = OS_LOG_DEFAULT, log_type: int = OS_LOG_TYPE_DEFAULT,
+                    flush_interval: Optional[float] = 1.0) -> contextlib.AbstractContextManager:
+    """A context manager that temporarily replaces ``sys.stdout`` with a :py:class:`Stream`, so that, e.g., ``print()``
+    output is sent to pyoslog. Any remaining output is sent when the context exits."""
+    return _redirect('stdout', log_object, log_type, flush_interval)
+
+
+def redirect_stderr(log_object: os_log_t = OS_LOG_DEFAULT, log_type: int = OS_LOG_TYPE_ERROR,
+                    flush_interval: Optional[float] = 1.0) -> contextlib.AbstractContextManager:
+    """As :py:func:`redirect_stdout`, but for ``sys.stderr``. Messages are of type :py:const:`pyoslog.OS_LOG_TYPE_ERROR`
+    by default."""
+    return _redirect('stderr', log_object, log_type, flush_interval)
@@ -57,6 +57,9 @@ setuptools.setup(
     packages=[NAME],
     ext_modules=ext_modules,
 
+    # provides the oslog_capture fixture (see pytest_plugin.py) - only loaded when pytest is used
+    entry_points={'pytest11': ['pyoslog = pyoslog.pytest_plugin']},
+
     # could do, e.g., 'typing;python_version<"3.5"' but some old versions don't support that syntax...
     install_requires=['typing'] if is_old_python_version else [],
 
@@ -0,0 +1,78 @@
+// A minimal stand-in for <os/log.h>, used to build and test _pyoslog on
+// platforms other than macOS (see test_faulthandler.py). Messages are appended
+// to the file named by the PYOSLOG_STUB_LOG environment variable, as records of
+// "type\tsubsystem\tcategory\tmessage" separated by \x1e. Only open(), write()
+// and close() are used, so logging is safe from signal handlers.
+#ifndef PYOSLOG_STUB_OS_LOG_H
+#define PYOSLOG_STUB_OS_LOG_H
+
+#include <fcntl.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+
+#include <os/object.h>
+
+typedef unsigned char os_log_type_t;
+#define OS_LOG_TYPE_DEFAULT 0x00
+#define OS_LOG_TYPE_INFO 0x01
+#define OS_LOG_TYPE_DEBUG 0x02
+#define OS_LOG_TYPE_ERROR 0x10
+#define OS_LOG_TYPE_FAULT 0x11
+
+struct os_log_s {
+  char subsystem[256];
+  char category[256];
+};
+typedef struct os_log_s *os_log_t;
+
+static struct os_log_s _os_log_default = {"", ""};
+#define OS_LOG_DEFAULT (&_os_log_default)
+#define OS_LOG_DISABLED ((os_log_t)NULL)
+
+static inline os_log_t os_log_create(const char *subsystem,
+                                     const char *category) {
+  os_log_t log = (os_log_t)calloc(1, sizeof(struct os_log_s));
+  if (log != NULL) {
+    strncpy(log->subsystem, subsystem, sizeof(log->subsystem) - 1);
+    strncpy(log->category, category, sizeof(log->category) - 1);
+  }
+  return log;
+}
+
+// as on macOS, debug messages are disabled by default
+static inline int os_log_type_enabled(os_log_t log, os_log_type_t type) {
+  return log != OS_LOG_DISABLED && type != OS_LOG_TYPE_DEBUG;
+}
+
+static inline void _pyoslog_stub_write(int fd, const char *text) {
+  write(fd, text, strlen(text));
+}
+
+static inline void _pyoslog_stub_log(os_log_t log, os_log_type_t type,
+                                     const char *message) {
+  const char *path = getenv("PYOSLOG_STUB_LOG");
+  if (!os_log_type_enabled(log, type) || path == NULL) {
+    return;
+  }
+  int fd = open(path, O_WRONLY | O_APPEND | O_CREAT, 0644);
+  if (fd < 0) {
+    return;
+  }
+  const char digits[] = "0123456789abcdef";
+  char type_string[] = {digits[type >> 4], digits[type & 0xf], '\t', '\0'};
+  _pyoslog_stub_write(fd, type_string);
+  _pyoslog_stub_write(fd, log->subsystem);
+  _pyoslog_stub_write(fd, "\t");
+  _pyoslog_stub_write(fd, log->category);
+  _pyoslog_stub_write(fd, "\t");
+  _pyoslog_stub_write(fd, message);
+  _pyoslog_stub_write(fd, "\x1e");
+  close(fd);
+}
+
+// _pyoslog always passes the message via a single "%{public}s" format
+#define os_log_with_type(log, type, format, message)                           \
+  _pyoslog_stub_log(log, type, message)
+
+#endif
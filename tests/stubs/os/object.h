@@ -0,0 +1,9 @@
+// A minimal stand-in for <os/object.h> - see log.h
+#ifndef PYOSLOG_STUB_OS_OBJECT_H
+#define PYOSLOG_STUB_OS_OBJECT_H
+
+#include <stdlib.h>
+
+#define os_release(object) free(object)
+
+#endif
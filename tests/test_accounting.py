@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import accounting as pyoslog_accounting
+from pyoslog import aio as pyoslog_aio
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import handler as pyoslog_handler
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'accounting')
+
+
+def log_often():
+    for _ in range(100):
+        pyoslog_core.log('Frequent message')
+
+
+def log_rarely():
+    pyoslog_core.os_log_error(pyoslog_core.OS_LOG_DEFAULT, 'Rare message')
+
+
+def log_via_handler(logger):
+    logger.error('Handler message')
+
+
+async def log_via_aio(logger):
+    pyoslog_aio.log_nowait('Nowait message')
+    await pyoslog_aio.log('Awaited message')
+    logger.error('Async handler message')
+    await pyoslog_aio.shutdown()
+
+
+class TestAccounting(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture()
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+    def tearDown(self):
+        pyoslog_accounting.disable_hotspots()
+        self.capture.uninstall()
+
+    def test_hotspots(self):
+        pyoslog_accounting.enable_hotspots(sample_interval=1)
+        log_often()
+        log_rarely()
+        self.assertEqual(self.capture.count(), 101)  # accounting must not change what is logged
+
+        top, second = pyoslog_accounting.hotspots()
+        self.assertEqual((top.filename, top.function, top.calls, top.bytes), (__file__, 'log_often', 100, 1600))
+        self.assertEqual((second.function, second.calls), ('log_rarely', 1))
+        self.assertGreater(top.seconds, 0)
+        self.assertEqual(len(pyoslog_accounting.hotspots(limit=1)), 1)
+
+        # totals remain available after disabling, but are no longer updated
+        pyoslog_accounting.disable_hotspots()
+        log_rarely()
+        self.assertEqual(pyoslog_accounting.hotspots()[1].calls, 1)
+
+    def test_sampling(self):
+        pyoslog_accounting.enable_hotspots(sample_interval=10)
+        log_often()
+        hotspot, = pyoslog_accounting.hotspots()
+        self.assertEqual(hotspot.calls, 100)  # 10 samples, scaled by the interval
+        self.assertEqual(self.capture.count(), 100)
+
+    def test_max_locations(self):
+        pyoslog_accounting.enable_hotspots(sample_interval=1, max_locations=1)
+        log_often()
+        log_rarely()
+        hotspot, = pyoslog_accounting.hotspots()
+        self.assertEqual((hotspot.function, hotspot.calls), ('log_rarely', 101))  # an upper bound for the newcomer
+
+        with self.assertRaises(ValueError):
+            pyoslog_accounting.enable_hotspots(sample_interval=0)
+
+    def test_handler(self):
+        logger = logging.getLogger('Pyoslog test logger (accounting)')
+        logger.setLevel(logging.DEBUG)
+        handler = pyoslog_handler.Handler()
+        handler.setSubsystem(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        logger.addHandler(handler)
+        try:
+            pyoslog_accounting.enable_hotspots(sample_interval=1)
+            log_via_handler(logger)
+        finally:
+            logger.removeHandler(handler)
+
+        hotspot, = pyoslog_accounting.hotspots()
+        self.assertEqual((hotspot.filename, hotspot.lineno, hotspot.function, hotspot.calls),
+                         (__file__, log_via_handler.__code__.co_firstlineno + 1, 'log_via_handler', 1))
+        self.assertEqual(self.capture.last(log_object=self.log).message, 'Handler message')
+
+    def test_aio(self):
+        logger = logging.getLogger('Pyoslog test logger (accounting, aio)')
+        handler = pyoslog_aio.AsyncHandler()
+        logger.addHandler(handler)
+        loop = asyncio.new_event_loop()
+        try:
+            pyoslog_accounting.enable_hotspots(sample_interval=1)
+            loop.run_until_complete(log_via_aio(logger))
+        finally:
+            loop.close()
+            logger.removeHandler(handler)
+
+        first_line = log_via_aio.__code__.co_firstlineno
+        self.assertEqual(sorted((h.filename, h.lineno, h.function, h.calls) for h in pyoslog_accounting.hotspots()),
+                         [(__file__, first_line + i, 'log_via_aio', 1) for i in range(1, 4)])
+        self.assertEqual([e.message for e in self.capture.entries],
+                         ['Nowait message', 'Awaited message', 'Async handler message'])
+
+    def test_summary(self):
+        pyoslog_accounting.enable_hotspots(sample_interval=1, summary_interval=0.05, summary_log_object=self.log)
+        log_often()
+        entries = self.capture.wait_for(log_object=self.log, pattern='^pyoslog hotspots:', timeout=5)
+        self.assertIn('log_often', entries[0].message)
+        self.assertIn('100 calls', entries[0].message)
+
+        # summaries are sent directly, so are not counted as hotspots themselves
+        self.assertEqual([h.function for h in pyoslog_accounting.hotspots()], ['log_often'])
+
+
+if __name__ == '__main__':
+    unittest.main()
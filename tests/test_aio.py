@@ -0,0 +1,167 @@
+import asyncio
+import gc
+import logging
+import threading
+import unittest
+import weakref
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import aio as pyoslog_aio
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'aio')
+
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_DEFAULT,
+                                                                 pyoslog_core.OS_LOG_TYPE_ERROR])
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.run_until_complete(pyoslog_aio.shutdown())
+        self.loop.close()
+        self.capture.uninstall()
+
+    def test_os_log_with_type(self):
+        async def send_messages():
+            for i in range(1000):
+                await pyoslog_aio.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Message', i)
+            await pyoslog_aio.log('Default message')
+            await pyoslog_aio.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_DEBUG, 'Disabled type')
+            with self.assertRaises(TypeError):
+                await pyoslog_aio.os_log_with_type(self.log, -1, 'Invalid type')
+            await pyoslog_aio.flush()
+            self.assertEqual(len(self.capture.entries), 1001)
+            await pyoslog_aio.shutdown()
+
+        self.loop.run_until_complete(send_messages())
+        self.assertEqual([e.message for e in self.capture.find(log_object=self.log)],
+                         ['Message %d' % i for i in range(1000)])
+        self.assertEqual(self.capture.last(log_object=pyoslog_core.OS_LOG_DEFAULT).message, 'Default message')
+        self.assertNotIn(self.loop, pyoslog_aio._buffers)
+
+    def test_nowait(self):
+        logging_threads = []
+        thread_sink = lambda *args: logging_threads.append(threading.current_thread())  # noqa: E731
+
+        async def send_messages():
+            for i in range(100):
+                pyoslog_aio.log_nowait('Message', i, log_object=self.log, log_type=pyoslog_core.OS_LOG_TYPE_ERROR)
+            self.assertLess(len(self.capture.entries), 100)  # nothing is logged until the loop runs the buffer task
+            await pyoslog_aio.flush()
+            self.assertEqual(len(self.capture.entries), 100)
+
+            pyoslog_aio.os_log_with_type_nowait(self.log, pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Loop', sinks=[thread_sink])
+            await pyoslog_aio.shutdown()
+
+        self.loop.run_until_complete(send_messages())
+        self.assertEqual(self.capture.last().message, 'Loop')
+        self.assertNotEqual(logging_threads, [threading.current_thread()])
+
+        # without a running loop, messages are logged immediately
+        pyoslog_aio.os_log_with_type_nowait(self.log, pyoslog_core.OS_LOG_TYPE_DEFAULT, 'No loop', sinks=[thread_sink])
+        self.assertEqual(self.capture.last().message, 'No loop')
+        self.assertEqual(logging_threads[-1], threading.current_thread())
+
+    def test_backpressure(self):
+        original_size = pyoslog_aio.MAX_BUFFER_SIZE
+        pyoslog_aio.MAX_BUFFER_SIZE = 2
+
+        async def send_messages():
+            await asyncio.gather(*[pyoslog_aio.log('Message', i) for i in range(50)])
+            for i in range(50, 100):  # messages that do not fit in the buffer are logged synchronously, not dropped
+                pyoslog_aio.log_nowait('Message', i)
+            await pyoslog_aio.flush()
+
+        try:
+            self.loop.run_until_complete(send_messages())
+        finally:
+            pyoslog_aio.MAX_BUFFER_SIZE = original_size
+        self.assertEqual([e.message for e in self.capture.entries], ['Message %d' % i for i in range(100)])
+
+    def test_loop_shutdown(self):
+        async def send_messages():
+            for i in range(500):
+                pyoslog_aio.log_nowait('Message', i)
+
+        # cancelling the background task (as asyncio.run() does when finishing) logs any remaining messages
+        self.loop.run_until_complete(send_messages())
+        loop_buffer = pyoslog_aio._buffers[self.loop]
+        loop_buffer.task.cancel()
+        self.loop.run_until_complete(asyncio.gather(loop_buffer.task, return_exceptions=True))
+        self.assertEqual([e.message for e in self.capture.entries], ['Message %d' % i for i in range(500)])
+
+    def test_closed_loop(self):
+        async def send_messages():
+            for i in range(500):
+                pyoslog_aio.log_nowait('Message', i)
+
+        # a loop that is closed without calling shutdown() is not kept alive, and its remaining messages are logged as
+        # soon as another loop starts buffering messages
+        closed_loop = asyncio.new_event_loop()
+        closed_loop.run_until_complete(send_messages())
+        closed_loop.close()
+        self.assertIn(closed_loop, pyoslog_aio._buffers)
+
+        self.loop.run_until_complete(pyoslog_aio.log('Message', 500))
+        self.assertNotIn(closed_loop, pyoslog_aio._buffers)
+        self.loop.run_until_complete(pyoslog_aio.flush())
+        self.assertEqual([e.message for e in self.capture.entries], ['Message %d' % i for i in range(501)])
+
+        closed_loop_reference = weakref.ref(closed_loop)
+        del closed_loop
+        gc.collect()
+        self.assertIsNone(closed_loop_reference())
+
+        # buffers (and their tasks) are discarded whenever they are empty, so idle loops are not kept alive either
+        self.assertNotIn(self.loop, pyoslog_aio._buffers)
+
+    def test_async_handler(self):
+        handler = pyoslog_aio.AsyncHandler(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        logger = logging.getLogger('Pyoslog aio test logger')
+        logger.addHandler(handler)
+
+        async def send_messages():
+            logger.error('Handler message')
+            self.assertIsNone(self.capture.last())
+            await pyoslog_aio.shutdown()
+
+        self.loop.run_until_complete(send_messages())
+        self.assertEqual(self.capture.last(log_object=self.log).message, 'Handler message')
+
+        thread = threading.Thread(target=logger.warning, args=('Handler message from thread',))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.capture.last(log_object=self.log).message, 'Handler message from thread')
+
+        # as for Handler, errors (e.g., when formatting) are reported via handleError() rather than raised
+        handled_records = []
+        handler.handleError = handled_records.append
+
+        async def send_invalid_message():
+            # passed to the handler directly, as other handlers (e.g., a test runner's) may not accept invalid messages
+            handler.handle(logger.makeRecord(logger.name, logging.ERROR, __file__, 0, 'Invalid %d', ('message',), None))
+            await pyoslog_aio.shutdown()
+
+        try:
+            self.loop.run_until_complete(send_invalid_message())
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual([r.msg for r in handled_records], ['Invalid %d'])
+        self.assertEqual(self.capture.last(log_object=self.log).message, 'Handler message from thread')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import bound as pyoslog_bound
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'bound')
+
+
+class TestBound(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_DEFAULT,
+                                                                 pyoslog_core.OS_LOG_TYPE_INFO,
+                                                                 pyoslog_core.OS_LOG_TYPE_ERROR,
+                                                                 pyoslog_core.OS_LOG_TYPE_FAULT])
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+    def tearDown(self):
+        self.capture.uninstall()
+
+    def test_bind(self):
+        logger = pyoslog_bound.bind(self.log, request='a1', tenant='example')
+        self.assertEqual(logger.context, {'request': 'a1', 'tenant': 'example'})
+        self.assertEqual(repr(logger), "<BoundLogger %s {'request': 'a1', 'tenant': 'example'}>" % self.log)
+
+        logging_methods = [
+            (logger.default, pyoslog_core.OS_LOG_TYPE_DEFAULT),
+            (logger.info, pyoslog_core.OS_LOG_TYPE_INFO),
+            (logger.error, pyoslog_core.OS_LOG_TYPE_ERROR),
+            (logger.fault, pyoslog_core.OS_LOG_TYPE_FAULT)
+        ]
+        for log_method, log_type in logging_methods:
+            log_method('Bound message of type', log_type)
+            received_message = self.capture.last()
+            self.assertEqual(received_message.message, 'request=a1 tenant=example Bound message of type %d' % log_type)
+            self.assertEqual(received_message.type, log_type)
+            self.assertEqual(received_message.subsystem, pyoslog_test_globals.LOG_SUBSYSTEM)
+
+        logger.log('Single string')
+        self.assertEqual(self.capture.last().message, 'request=a1 tenant=example Single string')
+        self.assertEqual(self.capture.last().type, pyoslog_core.OS_LOG_TYPE_DEFAULT)
+
+        default_logger = pyoslog_bound.bind(worker=1)
+        self.assertIs(default_logger.log_object, pyoslog_core.OS_LOG_DEFAULT)
+        default_logger.log(None)
+        self.assertEqual(self.capture.last().message, 'worker=1 None')
+        pyoslog_bound.bind(self.log).error('No context')
+        self.assertEqual(self.capture.last().message, 'No context')
+
+    def test_chaining(self):
+        logger = pyoslog_bound.bind(self.log, request='a1')
+        child = logger.bind(worker=2)
+        child.error('Child')
+        self.assertEqual(self.capture.last().message, 'request=a1 worker=2 Child')
+        self.assertEqual(logger.context, {'request': 'a1'})  # the parent is unchanged
+
+        child.bind(request='b2').error('Replaced')
+        self.assertEqual(self.capture.last().message, 'request=b2 worker=2 Replaced')
+
+    def test_disabled(self):
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError('disabled messages should not be formatted')
+
+        logger = pyoslog_bound.bind(self.log, request='a1')
+        logger.debug(Unformattable())
+        pyoslog_bound.bind(pyoslog_core.OS_LOG_DISABLED, request='a1').error(Unformattable())
+        self.assertEqual(self.capture.entries, [])
+        self.assertRaises(TypeError, logger.log, 'Invalid type', log_type=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
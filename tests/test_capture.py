@@ -0,0 +1,139 @@
+import logging
+import re
+import threading
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+# note: capture tests do not require macOS, so we use the submodules directly rather than relying on is_supported()
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import handler as pyoslog_handler
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'capture')
+
+
+class TestCapture(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture()
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+    def tearDown(self):
+        self.capture.uninstall()
+        self.assertIsNone(pyoslog_core._backend)
+
+    def test_os_log_create(self):
+        self.assertIsInstance(self.log, pyoslog_core.os_log_t)
+        self.assertEqual(str(self.log), '<os_log_t (%s:%s)>' % (pyoslog_test_globals.LOG_SUBSYSTEM,
+                                                                pyoslog_test_globals.LOG_CATEGORY))
+
+        # validation should match the native module (see test_setup.py)
+        self.assertRaises(TypeError, pyoslog_core.os_log_create, None, None)
+        self.assertRaises(ValueError, pyoslog_core.os_log_create, '', pyoslog_test_globals.LOG_CATEGORY)
+        self.assertRaises(ValueError, pyoslog_core.os_log_create, 250 * 'p', pyoslog_test_globals.LOG_CATEGORY)
+        self.assertRaises(ValueError, pyoslog_core.os_log_create, pyoslog_test_globals.LOG_SUBSYSTEM, 255 * 'p')
+
+    def test_os_log_with_type(self):
+        for invalid_object in pyoslog_test_globals.INVALID_LOG_OBJECTS:
+            self.assertRaises(TypeError, pyoslog_core.os_log_with_type, invalid_object,
+                              pyoslog_core.OS_LOG_TYPE_DEFAULT, 'message')
+        for invalid_type in pyoslog_test_globals.INVALID_LOG_TYPES:
+            self.assertRaises(TypeError, pyoslog_core.os_log_with_type, self.log, invalid_type, 'message')
+
+        for log_type in pyoslog_test_globals.TestLogTypes:
+            sent_message = 'Custom log object message with type 0x%x (%s)' % (log_type.value, log_type)
+            pyoslog_core.os_log_with_type(self.log, log_type.value, sent_message)
+            received_message = self.capture.last()
+            self.assertEqual(received_message.type, log_type)
+            self.assertEqual(received_message.subsystem, pyoslog_test_globals.LOG_SUBSYSTEM)
+            self.assertEqual(received_message.category, pyoslog_test_globals.LOG_CATEGORY)
+            self.assertEqual(received_message.message, sent_message)
+
+            pyoslog_core.os_log_with_type(pyoslog_core.OS_LOG_DEFAULT, log_type.value, sent_message)
+            received_message = self.capture.last()
+            self.assertIsNone(received_message.subsystem)
+            self.assertIsNone(received_message.category)
+
+            # OS_LOG_DISABLED messages are never recorded
+            pyoslog_core.os_log_with_type(pyoslog_core.OS_LOG_DISABLED, log_type.value, 'disabled')
+            self.assertEqual(self.capture.last(), received_message)
+            self.assertFalse(pyoslog_core.os_log_type_enabled(pyoslog_core.OS_LOG_DISABLED, log_type.value))
+
+        self.assertEqual(len(self.capture.entries), 2 * len(pyoslog_test_globals.TestLogTypes))
+        self.capture.clear()
+        self.assertEqual(self.capture.entries, [])
+        self.assertIsNone(self.capture.last())
+
+    def test_enabled_types(self):
+        self.capture.uninstall()
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_ERROR])
+        self.capture.install()
+
+        self.assertTrue(pyoslog_core.os_log_type_enabled(self.log, pyoslog_core.OS_LOG_TYPE_ERROR))
+        self.assertFalse(pyoslog_core.os_log_debug_enabled(self.log))
+        pyoslog_core.os_log_debug(self.log, 'not recorded')
+        pyoslog_core.os_log_error(self.log, 'recorded')
+        self.assertEqual([e.message for e in self.capture.entries], ['recorded'])
+
+    def test_find(self):
+        other_log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, 'other')
+        for i in range(10):
+            pyoslog_core.os_log_info(self.log, 'info', i)
+            pyoslog_core.os_log_error(other_log, 'error', i)
+        pyoslog_core.log('default log object')
+
+        self.assertEqual(self.capture.count(), 21)
+        self.assertEqual(self.capture.count(log_object=self.log), 10)
+        self.assertEqual(self.capture.count(log_type=pyoslog_core.OS_LOG_TYPE_ERROR), 10)
+        self.assertEqual(self.capture.count(log_object=self.log, log_type=pyoslog_core.OS_LOG_TYPE_ERROR), 0)
+        self.assertEqual(self.capture.count(log_object=pyoslog_core.OS_LOG_DEFAULT), 1)
+        self.assertEqual([e.message for e in self.capture.find(log_object=other_log, pattern=r'[5-6]$')],
+                         ['error 5', 'error 6'])
+        self.assertEqual(self.capture.last(pattern=re.compile('^INFO', re.IGNORECASE)).message, 'info 9')
+
+        timestamps = [e.timestamp for e in self.capture.entries]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_wait_for(self):
+        self.assertEqual(self.capture.wait_for(pattern='never sent', timeout=0.01), [])
+
+        thread = threading.Timer(0.05, pyoslog_core.os_log_fault, (self.log, 'from another thread'))
+        thread.start()
+        received_messages = self.capture.wait_for(log_type=pyoslog_core.OS_LOG_TYPE_FAULT, timeout=5)
+        thread.join()
+        self.assertEqual([e.message for e in received_messages], ['from another thread'])
+
+    def test_handler(self):
+        handler = pyoslog_handler.Handler(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        logger = logging.getLogger('Pyoslog capture test logger')
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+
+        logging_levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL]
+        for log_level in logging_levels:
+            sent_message = 'Handler message via logger.log() at level %d' % log_level
+            logger.log(log_level, sent_message)
+            received_message = self.capture.last(log_object=self.log)
+            self.assertEqual(received_message.type, pyoslog_test_globals.logging_level_to_type(log_level))
+            self.assertEqual(received_message.message, sent_message)
+        logger.removeHandler(handler)
+
+    def test_nested(self):
+        with pyoslog_capture.LogCapture() as inner_capture:
+            pyoslog_core.log('inner')
+        pyoslog_core.log('outer')
+        self.assertIs(pyoslog_core._backend, self.capture)
+        self.assertEqual([e.message for e in inner_capture.entries], ['inner'])
+        self.assertEqual([e.message for e in self.capture.entries], ['outer'])
+
+
+if __name__ == '__main__':
+    unittest.main()
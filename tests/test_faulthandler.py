@@ -0,0 +1,145 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'faulthandler')
+
+TESTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIRECTORY = os.path.dirname(TESTS_DIRECTORY)
+
+CRASH_SCRIPT = textwrap.dedent('''
+    import ctypes
+    import gc
+    import os
+    import sys
+    from pyoslog import core, faulthandler
+
+    log = core.os_log_create(%r, 'faulthandler')
+    if 'file' in sys.argv:
+        # no other reference to the file is kept, so if it were closed, the second file would reuse its descriptor
+        faulthandler.enable(log, file=open(sys.argv[-1], 'w'))
+        gc.collect()
+        other_file = open(sys.argv[-1] + '.other', 'w')
+    else:
+        faulthandler.enable(log, file=sys.stderr if 'echo' in sys.argv else None)
+    if 'disable' in sys.argv:
+        faulthandler.disable()
+
+    def crash_with_segfault():
+        ctypes.string_at(0)
+
+    def crash_with_abort():
+        os.abort()
+
+    def crash_with_deep_stack(depth):
+        return crash_with_deep_stack(depth - 1) if depth else crash_with_segfault()
+
+    if 'deep' in sys.argv:
+        crash_with_deep_stack(80)
+    crash_with_abort() if 'abort' in sys.argv else crash_with_segfault()
+''' % pyoslog_test_globals.LOG_SUBSYSTEM)
+
+
+class TestFaulthandler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the native module is built against a stand-in for os/log.h (see stubs/os/log.h) that records messages in a
+        # file, so that what is logged from the signal handler can be checked on any platform
+        cls.build_directory = tempfile.mkdtemp()
+        result = subprocess.run([sys.executable, 'setup.py', '--quiet', 'build_ext', '--build-lib',
+                                 cls.build_directory, '--build-temp', os.path.join(cls.build_directory, 'temp')],
+                                cwd=ROOT_DIRECTORY, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                env=dict(os.environ, PYOSLOG_OVERRIDE_IS_SUPPORTED='1',
+                                         CFLAGS='-I%s' % os.path.join(TESTS_DIRECTORY, 'stubs')))
+        if result.returncode != 0 or not any(f.startswith('_pyoslog') for f in os.listdir(cls.build_directory)):
+            shutil.rmtree(cls.build_directory)
+            skip_reason = 'Warning: unable to build _pyoslog against the stand-in os/log.h; unable to test faulthandler'
+            print(skip_reason)
+            raise unittest.SkipTest(skip_reason)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.build_directory)
+
+    def crash(self, *arguments):
+        log_path = os.path.join(self.build_directory, 'log')
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        result = subprocess.run([sys.executable, '-c', CRASH_SCRIPT] + list(arguments), stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True,
+                                env=dict(os.environ, PYOSLOG_STUB_LOG=log_path, PYOSLOG_OVERRIDE_IS_SUPPORTED='1',
+                                         PYTHONPATH=os.pathsep.join([self.build_directory, ROOT_DIRECTORY])))
+        entries = []
+        if os.path.exists(log_path):
+            with open(log_path) as log_file:
+                entries = [record.split('\t', 3) for record in log_file.read().split('\x1e') if record]
+        return result, entries
+
+    def test_segfault(self):
+        result, entries = self.crash()
+        self.assertEqual(result.returncode, -signal.SIGSEGV)
+        self.assertEqual(result.stderr.count('Fatal Python error'), 0)  # only logged, unless a file is given
+        self.assertTrue(entries)
+        for log_type, subsystem, category, _ in entries:
+            self.assertEqual((log_type, subsystem, category), ('11', pyoslog_test_globals.LOG_SUBSYSTEM,
+                                                               'faulthandler'))
+            self.assertEqual(int(log_type, 16), pyoslog_test_globals.TestLogTypes.OS_LOG_TYPE_FAULT)
+
+        traceback = '\n'.join(entry[3] for entry in entries)
+        self.assertTrue(traceback.startswith('Fatal Python error: Segmentation fault'))
+        self.assertIn('in crash_with_segfault', traceback)
+        self.assertIn('(most recent call first)', traceback)
+
+    def test_abort_and_echo(self):
+        result, entries = self.crash('abort', 'echo')
+        self.assertEqual(result.returncode, -signal.SIGABRT)
+        traceback = '\n'.join(entry[3] for entry in entries)
+        self.assertTrue(traceback.startswith('Fatal Python error: Aborted'))
+        self.assertIn('in crash_with_abort', traceback)
+        self.assertIn('in crash_with_abort', result.stderr)  # the same traceback is also written to the given file
+        self.assertTrue(all(len(entry[3]) < 1024 for entry in entries))
+
+    def test_deep_stack(self):
+        result, entries = self.crash('deep', 'echo')
+        self.assertEqual(result.returncode, -signal.SIGSEGV)
+
+        # a traceback longer than the maximum message length is split into several messages, only between lines
+        self.assertGreater(len(result.stderr), 2048)
+        self.assertGreater(len(entries), 2)
+        self.assertTrue(all(len(entry[3]) < 1024 for entry in entries))
+        self.assertEqual('\n'.join(entry[3] for entry in entries), result.stderr.rstrip('\n'))
+        self.assertEqual(result.stderr.count('in crash_with_deep_stack'), 81)
+
+    def test_unreferenced_file(self):
+        file_path = os.path.join(self.build_directory, 'traceback')
+        result, entries = self.crash('file', file_path)
+        self.assertEqual(result.returncode, -signal.SIGSEGV)
+        self.assertTrue(entries)
+        with open(file_path) as traceback_file:
+            self.assertIn('in crash_with_segfault', traceback_file.read())
+        with open(file_path + '.other') as other_file:
+            self.assertEqual(other_file.read(), '')
+
+    def test_disable(self):
+        result, entries = self.crash('disable')
+        self.assertEqual(result.returncode, -signal.SIGSEGV)
+        self.assertEqual(entries, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import contextlib
+import io
+import logging
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import logger as pyoslog_logger
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'logger')
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_DEFAULT,
+                                                                 pyoslog_core.OS_LOG_TYPE_INFO,
+                                                                 pyoslog_core.OS_LOG_TYPE_ERROR,
+                                                                 pyoslog_core.OS_LOG_TYPE_FAULT])
+        self.capture.install()
+        self.logger = pyoslog_logger.getLogger('pyoslog.test.logger', subsystem=pyoslog_test_globals.LOG_SUBSYSTEM)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.capture.uninstall()
+
+    def test_get_logger(self):
+        self.assertIsInstance(self.logger, pyoslog_logger.Logger)
+        self.assertIs(logging.getLogger('pyoslog.test.logger'), self.logger)
+        self.assertIs(pyoslog_logger.getLogger('pyoslog.test.logger'), self.logger)
+        self.assertEqual(str(self.logger.log_object), '<os_log_t (%s:pyoslog.test.logger)>' %
+                         pyoslog_test_globals.LOG_SUBSYSTEM)
+
+        # only the requested logger is affected
+        self.assertNotIsInstance(logging.getLogger('pyoslog.test.logger.child'), pyoslog_logger.Logger)
+        self.assertNotIsInstance(logging.getLogger('pyoslog.test.other'), pyoslog_logger.Logger)
+        with self.assertRaises(ValueError):
+            pyoslog_logger.getLogger('pyoslog.test.other')
+
+    def test_levels(self):
+        self.logger.debug('Debug message')  # debug is disabled in the capture, so is never formatted
+        self.logger.info('Info %s', 'message')
+        self.logger.warning('Warning %(key)s', {'key': 'message'})
+        self.logger.error('Error message')
+        self.logger.critical('Critical message')
+        self.logger.log(logging.INFO, 42)
+        self.assertEqual([(e.type, e.message) for e in self.capture.find()], [
+            (pyoslog_core.OS_LOG_TYPE_INFO, 'Info message'),
+            (pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Warning message'),
+            (pyoslog_core.OS_LOG_TYPE_ERROR, 'Error message'),
+            (pyoslog_core.OS_LOG_TYPE_FAULT, 'Critical message'),
+            (pyoslog_core.OS_LOG_TYPE_INFO, '42')])
+
+        self.capture.clear()
+        self.logger.setLevel(logging.ERROR)
+        self.assertFalse(self.logger.isEnabledFor(logging.WARNING))
+        self.logger.warning('Ignored message')
+        self.logger.error('Error message')
+        self.assertEqual([e.message for e in self.capture.find()], ['Error message'])
+
+    def test_exception(self):
+        try:
+            raise RuntimeError('Test exception')
+        except RuntimeError as e:
+            self.logger.exception('Failed')
+            self.logger.error('Also failed', exc_info=e)
+        first, second = self.capture.find(log_type=pyoslog_core.OS_LOG_TYPE_ERROR)
+        self.assertTrue(first.message.startswith('Failed\nTraceback (most recent call last):'))
+        self.assertTrue(first.message.endswith('RuntimeError: Test exception'))
+        self.assertEqual(second.message, first.message.replace('Failed', 'Also failed', 1))
+
+    def test_fallback_handlers(self):
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        self.logger.addHandler(handler)
+        try:
+            self.logger.info('Info %s', 'message')
+        finally:
+            self.logger.removeHandler(handler)
+        self.assertEqual([r.getMessage() for r in records], ['Info message'])
+        self.assertEqual(records[0].pathname, __file__)  # attributed to the caller rather than pyoslog's logger
+        self.assertEqual(self.capture.last().message, 'Info message')  # sent to the unified log exactly once
+        self.assertEqual(self.capture.count(), 1)
+
+        # handlers added to (and removed from) ancestors are noticed, however they are changed
+        self.logger.propagate = True
+        root_logger = logging.getLogger()
+        original_root_handlers = root_logger.handlers
+        try:
+            self.logger.info('Before adding')
+            root_logger.addHandler(handler)
+            self.logger.warning('Warning %(key)s', {'key': 'message'})
+            root_logger.removeHandler(handler)
+            self.logger.info('After removing')
+            root_logger.handlers = [handler]
+            self.logger.info('Replaced handlers')
+        finally:
+            root_logger.handlers = original_root_handlers
+        self.assertEqual([r.getMessage() for r in records], ['Info message', 'Warning message', 'Replaced handlers'])
+        self.assertEqual([e.message for e in self.capture.entries][-4:],
+                         ['Before adding', 'Warning message', 'After removing', 'Replaced handlers'])
+
+        # as are changes to whether ancestors propagate
+        parent_logger = logging.getLogger('pyoslog.test')
+        parent_logger.propagate = False
+        root_logger.addHandler(handler)
+        try:
+            self.logger.info('Not propagated')
+            parent_logger.propagate = True
+            self.logger.info('Propagated')
+        finally:
+            root_logger.removeHandler(handler)
+        self.assertEqual([r.getMessage() for r in records][-1:], ['Propagated'])
+
+    def test_filters(self):
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        original_handlers = self.logger.handlers
+        self.logger.handlers = [handler]  # replacing any added by a test runner, which may not accept invalid messages
+        self.logger.addFilter(lambda record: record.args != ('filtered',))
+        try:
+            self.logger.info('Message %s', 'filtered')
+            self.logger.warning('Message %s', 'passed')
+            try:
+                raise RuntimeError('Test exception')
+            except RuntimeError:
+                self.logger.exception('Exception %s', 'passed')
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                self.logger.info('Number %d', 'not a number')  # not logged, as in the standard path
+            self.assertIn("Message: 'Number %d'", stderr.getvalue())
+        finally:
+            self.logger.handlers = original_handlers
+            self.logger.filters.clear()
+
+        # filters are applied to messages sent to the unified log as well as those passed to handlers
+        self.assertEqual([(e.type, e.message.split('\n')[0]) for e in self.capture.entries],
+                         [(pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Message passed'),
+                          (pyoslog_core.OS_LOG_TYPE_ERROR, 'Exception passed')])
+        self.assertTrue(self.capture.last().message.endswith('RuntimeError: Test exception'))
+        self.assertEqual([r.getMessage() for r in records[:2]], ['Message passed', 'Exception passed'])
+        self.assertEqual(records[0].pathname, __file__)
+
+        self.logger.addFilter(lambda record: False)
+        try:
+            self.logger.error('Never logged')  # without handlers
+        finally:
+            self.logger.filters.clear()
+        self.assertEqual(self.capture.count(), 2)
+
+    def test_formatting_error(self):
+        original_handlers = self.logger.handlers
+        self.logger.handlers = []  # as above - only pyoslog's own reporting is tested here
+        stderr = io.StringIO()
+        original_raise_exceptions = logging.raiseExceptions
+        try:
+            with contextlib.redirect_stderr(stderr):
+                self.logger.info('Number %d', 'not a number')  # reported as in the logging module, not raised
+            self.assertIn('--- Logging error ---', stderr.getvalue())
+            self.assertIn("Message: 'Number %d'", stderr.getvalue())
+            self.assertEqual(self.capture.count(), 0)
+
+            logging.raiseExceptions = False
+            with contextlib.redirect_stderr(stderr):
+                self.logger.info('Number %d', 'not a number')
+        finally:
+            logging.raiseExceptions = original_raise_exceptions
+            self.logger.handlers = original_handlers
+        self.assertEqual(stderr.getvalue().count('--- Logging error ---'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import io
+import json
+import logging
+import time
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import handler as pyoslog_handler
+from pyoslog import packing as pyoslog_packing
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'packing')
+
+
+class TestPacking(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_DEFAULT,
+                                                                 pyoslog_core.OS_LOG_TYPE_INFO,
+                                                                 pyoslog_core.OS_LOG_TYPE_ERROR,
+                                                                 pyoslog_core.OS_LOG_TYPE_FAULT])
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+    def tearDown(self):
+        pyoslog_packing.disable_packing()
+        self.capture.uninstall()
+
+    def unpacked_messages(self):
+        return [text for entry in self.capture.find() for _, text in pyoslog_packing.unpack(entry.message)]
+
+    def test_packing(self):
+        pyoslog_packing.enable_packing(window=60)
+        for i in range(100):
+            pyoslog_core.os_log_info(self.log, 'Message', i)
+        pyoslog_core.os_log_debug(self.log, 'Disabled message')  # not enabled, so never buffered
+        self.assertLess(self.capture.count(), 100)  # full entries are sent without waiting for the window
+
+        pyoslog_packing.flush_packed_messages()
+        entries = self.capture.find()
+        self.assertTrue(all(e.type == pyoslog_core.OS_LOG_TYPE_INFO for e in entries))
+        self.assertTrue(all(len(e.message) <= pyoslog_core._MAX_MESSAGE_LENGTH for e in entries))
+        self.assertTrue(entries[0].message.startswith('pyoslog:packed:'))
+        self.assertEqual(self.unpacked_messages(), ['Message %d' % i for i in range(100)])
+
+        offsets = [offset for offset, _ in pyoslog_packing.unpack(entries[0].message)]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertTrue(all(offset <= 0 for offset in offsets))
+
+    def test_multi_byte_messages(self):
+        pyoslog_packing.enable_packing(window=60)
+        for i in range(10):
+            pyoslog_core.os_log_info(self.log, '\u20ac' * 100, i)  # 300 bytes when encoded, but only 100 characters
+        pyoslog_core.os_log_info(self.log, '\u20ac' * 400)  # short enough to pack if counting characters, not bytes
+        pyoslog_packing.flush_packed_messages()
+
+        entries = self.capture.find()
+        self.assertTrue(all(len(e.message.encode('utf-8')) <= pyoslog_core._MAX_MESSAGE_LENGTH for e in entries[:-1]))
+        self.assertEqual(entries[-1].message, '\u20ac' * 400)  # sent directly
+        self.assertEqual(self.unpacked_messages(), ['\u20ac' * 100 + ' %d' % i for i in range(10)] + ['\u20ac' * 400])
+
+    def test_order(self):
+        pyoslog_packing.enable_packing(window=60)
+        pyoslog_core.os_log_info(self.log, 'Info 1')
+        pyoslog_core.os_log_info(self.log, 'Info 2')
+        pyoslog_core.log('Default 1')
+        pyoslog_core.os_log(self.log, 'Default 2')  # a different type for the same log object sends the buffer
+        pyoslog_core.os_log(self.log, 'Multi-line\nmessage')  # messages that cannot be packed are sent directly
+        pyoslog_core.os_log(self.log, 'Default 3')
+        self.assertEqual(self.capture.count(), 3)
+
+        pyoslog_core.os_log_error(self.log, 'Error')  # higher-severity messages send every buffer first
+        self.assertEqual(self.unpacked_messages(), ['Info 1', 'Info 2', 'Default 2', 'Multi-line\nmessage',
+                                                    'Default 1', 'Default 3', 'Error'])
+        self.assertEqual(self.capture.last().type, pyoslog_core.OS_LOG_TYPE_ERROR)
+        self.assertEqual(self.capture.find(pattern='Default 3')[0].message, 'Default 3')  # single messages are unpacked
+
+    def test_window(self):
+        pyoslog_packing.enable_packing(window=0.05)
+        pyoslog_core.os_log_info(self.log, 'First')
+        pyoslog_core.os_log_info(self.log, 'Second')
+        start = time.monotonic()
+        entry, = self.capture.wait_for(timeout=5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([text for _, text in pyoslog_packing.unpack(entry.message)], ['First', 'Second'])
+
+        with self.assertRaises(ValueError):
+            pyoslog_packing.enable_packing(window=0)
+
+    def test_handler(self):
+        logger = logging.getLogger('Pyoslog test logger (packing)')
+        logger.setLevel(logging.INFO)
+        handler = pyoslog_handler.Handler()
+        handler.setSubsystem(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        logger.addHandler(handler)
+        try:
+            pyoslog_packing.enable_packing(window=60)
+            for i in range(10):
+                logger.info('Message %d', i)
+            logger.critical('Critical message')
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(self.capture.count(), 2)
+        self.assertEqual(self.unpacked_messages(), ['Message %d' % i for i in range(10)] + ['Critical message'])
+
+    def test_unpack(self):
+        self.assertEqual(pyoslog_packing.unpack('pyoslog:packed:2\n-1500.000 First\n-0.000 Second', 10.0),
+                         [(8.5, 'First'), (10.0, 'Second')])
+        for message in ['Plain message', 'pyoslog:packed:3\n-1.000 Count\n-0.000 mismatch', 'pyoslog:packed:2\nA\nB']:
+            self.assertEqual(pyoslog_packing.unpack(message, 1.0), [(1.0, message)])
+
+        ndjson = [json.dumps({'timestamp': '2022-06-02 10:41:58.523761+0100', 'eventMessage': 'pyoslog:packed:2\n'
+                                                                                            '-500.000 A\n-0.000 B'}),
+                  json.dumps({'timestamp': '2022-06-02 10:41:59.000000+0100', 'eventMessage': 'C'}),
+                  'Filtering the log data using "subsystem == \\"example\\""']
+        output = io.StringIO()
+        self.assertEqual(pyoslog_packing.unpack_ndjson(ndjson, output), 3)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([(e['timestamp'], e['eventMessage']) for e in map(json.loads, lines[:3])],
+                         [('2022-06-02 10:41:58.023761+0100', 'A'), ('2022-06-02 10:41:58.523761+0100', 'B'),
+                          ('2022-06-02 10:41:59.000000+0100', 'C')])
+        self.assertEqual(lines[3], ndjson[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'pytest_plugin')
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIXTURE_TESTS = textwrap.dedent('''
+    from pyoslog import capture, core
+
+    def test_fixture(oslog_capture):
+        assert isinstance(oslog_capture, capture.LogCapture)
+        assert core._backend is oslog_capture
+        core.os_log_error(core.OS_LOG_DEFAULT, 'Captured message')
+        assert oslog_capture.last(log_type=core.OS_LOG_TYPE_ERROR).message == 'Captured message'
+
+    def test_fixture_uninstalled():
+        assert core._backend is None
+''')
+
+
+class TestPytestPlugin(unittest.TestCase):
+    def setUp(self):
+        try:
+            import pytest  # noqa: F401
+        except ImportError:
+            skip_reason = 'Warning: pytest is not installed; unable to test the oslog_capture fixture'
+            print(skip_reason)
+            raise unittest.SkipTest(skip_reason)
+
+    def test_oslog_capture_fixture(self):
+        with tempfile.TemporaryDirectory() as test_directory:
+            with open(os.path.join(test_directory, 'test_fixture.py'), 'w') as test_file:
+                test_file.write(FIXTURE_TESTS)
+
+            # the plugin is loaded explicitly (rather than via its entry point) so this works without installing pyoslog
+            result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', '-p',
+                                     'pyoslog.pytest_plugin', 'test_fixture.py'], cwd=test_directory,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True,
+                                    env=dict(os.environ, PYTEST_DISABLE_PLUGIN_AUTOLOAD='1', PYTHONPATH=ROOT_DIRECTORY))
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn('2 passed', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
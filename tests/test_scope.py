@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import threading
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import aio as pyoslog_aio
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import handler as pyoslog_handler
+from pyoslog import stream as pyoslog_stream
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'scope')
+
+
+class TestScope(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture()
+        self.capture.install()
+
+    def tearDown(self):
+        self.capture.uninstall()
+
+    def test_scope(self):
+        with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY) as scoped_log:
+            self.assertEqual(str(scoped_log), '<os_log_t (%s:%s)>' % (pyoslog_test_globals.LOG_SUBSYSTEM,
+                                                                      pyoslog_test_globals.LOG_CATEGORY))
+            pyoslog_core.log('Scoped message')
+            self.assertEqual(self.capture.last(log_object=scoped_log).message, 'Scoped message')
+            pyoslog_core.os_log_error(pyoslog_core.OS_LOG_DEFAULT, 'Scoped error')
+            self.assertEqual(self.capture.last(log_object=scoped_log).message, 'Scoped error')
+
+            with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM) as nested_log:
+                pyoslog_core.log('Nested message')
+                self.assertEqual(self.capture.last().category, 'default')
+                self.assertIsNot(nested_log, scoped_log)
+            pyoslog_core.log('After nested scope')
+            self.assertEqual(self.capture.last().category, pyoslog_test_globals.LOG_CATEGORY)
+
+            # explicitly created log objects and OS_LOG_DISABLED are unaffected
+            custom_log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, 'custom')
+            pyoslog_core.os_log(custom_log, 'Custom message')
+            self.assertEqual(self.capture.last().category, 'custom')
+            pyoslog_core.os_log(pyoslog_core.OS_LOG_DISABLED, 'Disabled message')
+            self.assertEqual(self.capture.last().message, 'Custom message')
+
+        pyoslog_core.log('Unscoped message')
+        self.assertEqual(self.capture.last(log_object=pyoslog_core.OS_LOG_DEFAULT).message, 'Unscoped message')
+
+        # log objects are cached for each subsystem and category
+        with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY) as second_log:
+            self.assertIs(second_log, scoped_log)
+
+    def test_scope_backend_change(self):
+        with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM) as scoped_log:
+            pass
+        with pyoslog_capture.LogCapture() as inner_capture:
+            with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM) as inner_log:
+                pyoslog_core.log('Inner capture')
+        self.assertIsNot(inner_log, scoped_log)
+        self.assertEqual(inner_capture.last().subsystem, pyoslog_test_globals.LOG_SUBSYSTEM)
+
+    def test_handler(self):
+        logger = logging.getLogger('Pyoslog scope test logger')
+        handler = pyoslog_handler.Handler()
+        logger.addHandler(handler)
+        with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, 'handler'):
+            logger.error('Handler message')
+        self.assertEqual(self.capture.last().category, 'handler')
+        logger.removeHandler(handler)
+
+    def test_threads(self):
+        results = {}
+
+        def log_in_scope(category):
+            with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, category):
+                barrier.wait()
+                pyoslog_core.log('Thread message', category)
+
+        barrier = threading.Barrier(5)
+        threads = [threading.Thread(target=log_in_scope, args=('thread-%d' % i,)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for entry in self.capture.entries:
+            results[entry.category] = entry.message
+        self.assertEqual(results, {'thread-%d' % i: 'Thread message thread-%d' % i for i in range(5)})
+
+    def test_aio_and_stream(self):
+        async def log_in_scope(category):
+            with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, category):
+                await asyncio.sleep(0)
+                pyoslog_aio.log_nowait('Task message')
+                await pyoslog_aio.log('Task message')
+
+        async def run_tasks():
+            await asyncio.gather(*[log_in_scope('task-%d' % i) for i in range(3)])
+            await pyoslog_aio.shutdown()
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(run_tasks())
+        loop.close()
+        self.assertEqual(sorted(e.category for e in self.capture.entries), sorted(2 * ['task-%d' % i
+                                                                                      for i in range(3)]))
+
+        # partial lines flushed by a Stream's timer use the scope that was active when they were written
+        with pyoslog_core.scope(pyoslog_test_globals.LOG_SUBSYSTEM, 'stream'):
+            stream = pyoslog_stream.Stream(flush_interval=0.01)
+            stream.write('Partial line')
+        self.assertEqual(self.capture.wait_for(pattern='^Partial line$', timeout=5)[0].category, 'stream')
+        stream.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import handler as pyoslog_handler
+from pyoslog import sinks as pyoslog_sinks
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'sinks')
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        # sinks work in the same way with or without a capture, but this allows us to test on any platform
+        self.capture = pyoslog_capture.LogCapture(enabled_types=[pyoslog_core.OS_LOG_TYPE_DEFAULT,
+                                                                 pyoslog_core.OS_LOG_TYPE_ERROR])
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.ring_path = os.path.join(self.temporary_directory.name, 'ring.log')
+
+    def tearDown(self):
+        self.capture.uninstall()
+        self.temporary_directory.cleanup()
+
+    def test_callable_sink(self):
+        received_messages = []
+        sink = lambda *args: received_messages.append(args)  # noqa: E731
+        pyoslog_core.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Sink message', 1, sinks=[sink, sink])
+        self.assertEqual(received_messages, 2 * [(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Sink message 1')])
+        self.assertEqual(self.capture.last().message, 'Sink message 1')
+
+        # disabled types and log objects are not sent to sinks
+        pyoslog_core.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_DEBUG, 'Disabled type', sinks=[sink])
+        pyoslog_core.os_log_with_type(pyoslog_core.OS_LOG_DISABLED, pyoslog_core.OS_LOG_TYPE_ERROR, 'Disabled log',
+                                      sinks=[sink])
+        self.assertEqual(len(received_messages), 2)
+        self.assertEqual(len(self.capture.entries), 1)
+
+    def test_ring_buffer_sink(self):
+        self.assertRaises(ValueError, pyoslog_sinks.RingBufferSink, self.ring_path, 16)
+
+        sink = pyoslog_sinks.RingBufferSink(self.ring_path, 4096)
+        pyoslog_core.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'First message', sinks=[sink])
+        pyoslog_core.os_log_with_type(pyoslog_core.OS_LOG_DEFAULT, pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Second message',
+                                      sinks=[sink])
+        lines = pyoslog_sinks.RingBufferSink.read(self.ring_path)  # readable while the sink is still open
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith(' %s Error First message' % self.log))
+        self.assertTrue(lines[1].endswith(' <os_log_t (OS_LOG_DEFAULT)> Default Second message'))
+        sink.close()
+        sink(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'ignored after closing')
+
+        # reopening appends to the existing buffer; older messages are overwritten when the buffer is full
+        sink = pyoslog_sinks.RingBufferSink(self.ring_path, 4096)
+        for i in range(500):
+            sink(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Message %d' % i)
+        sink.close()
+        self.assertEqual(os.path.getsize(self.ring_path), 4096)
+        lines = pyoslog_sinks.RingBufferSink.read(self.ring_path)
+        self.assertTrue(lines[-1].endswith(' Message 499'))
+        self.assertTrue(lines[0].endswith(' Message %d' % (500 - len(lines))))
+
+        # a buffer of a different size replaces the existing file
+        sink = pyoslog_sinks.RingBufferSink(self.ring_path, 1024)
+        sink.close()
+        self.assertEqual(pyoslog_sinks.RingBufferSink.read(self.ring_path), [])
+
+    def test_threaded_sink(self):
+        release = threading.Event()
+        received_messages = []
+
+        def slow_sink(log_object, log_type, message):
+            release.wait()
+            received_messages.append(message)
+
+        sink = pyoslog_sinks.ThreadedSink(slow_sink, max_queue_size=3)
+        for i in range(10):
+            pyoslog_core.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, i, sinks=[sink])
+        self.assertEqual(len(self.capture.entries), 10)  # the unified log is not delayed by the slow sink
+        self.assertFalse(sink.flush(timeout=0.01))
+
+        release.set()
+        self.assertTrue(sink.flush(timeout=5))
+        sink.close()
+        self.assertEqual(len(received_messages) + sink.dropped, 10)
+        self.assertEqual(received_messages, sorted(received_messages, key=int))
+
+        # once closed, messages are no longer queued (where nothing would read them)
+        dropped = sink.dropped
+        sink(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'After closing')
+        self.assertEqual(sink.dropped, dropped + 1)
+        self.assertEqual(sink._queue.qsize(), 0)
+
+        overflow_messages = []
+        sink = pyoslog_sinks.ThreadedSink(slow_sink, overflow=lambda *args: overflow_messages.append(args[2]))
+        sink.close()
+        sink(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'After closing')
+        self.assertEqual(overflow_messages, ['After closing'])
+        self.assertEqual(sink.dropped, 0)
+
+    def test_handler(self):
+        format_count = []
+
+        class CountingFormatter(logging.Formatter):
+            def format(self, record):
+                format_count.append(record)
+                return logging.Formatter.format(self, record)
+
+        received_messages = []
+        handler = pyoslog_handler.Handler(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY,
+                                          sinks=[lambda *args: received_messages.append(args[2])])
+        handler.setFormatter(CountingFormatter('%(levelname)s: %(message)s'))
+        ring_sink = pyoslog_sinks.RingBufferSink(self.ring_path, 4096)
+        handler.addSink(ring_sink)
+
+        logger = logging.getLogger('Pyoslog sinks test logger')
+        logger.addHandler(handler)
+        logger.error('Handler message')
+        self.assertEqual(len(format_count), 1)
+        self.assertEqual(received_messages, ['ERROR: Handler message'])
+        self.assertEqual(self.capture.last().message, 'ERROR: Handler message')
+
+        handler.removeSink(ring_sink)
+        ring_sink.close()
+        logger.error('Second handler message')
+        self.assertEqual(len(pyoslog_sinks.RingBufferSink.read(self.ring_path)), 1)
+        self.assertEqual(len(received_messages), 2)
+        logger.removeHandler(handler)
+
+    def test_failing_sink(self):
+        received_messages = []
+
+        def failing_sink(log_object, log_type, message):
+            raise OSError('Sink failure')
+
+        sinks = [failing_sink, lambda *args: received_messages.append(args[2])]
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            pyoslog_core.os_log_with_type(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Core message', sinks=sinks)
+        self.assertIn('OSError: Sink failure', stderr.getvalue())  # reported, but never raised to the caller
+
+        handler_errors = []
+        handler = pyoslog_handler.Handler(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY,
+                                          sinks=sinks)
+        handler.handleError = handler_errors.append
+        logger = logging.getLogger('Pyoslog failing sink test logger')
+        logger.addHandler(handler)
+        try:
+            logger.error('Handler message')
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual([record.getMessage() for record in handler_errors], ['Handler message'])
+
+        # the unified log and the remaining sinks still receive every message
+        self.assertEqual([e.message for e in self.capture.entries], ['Core message', 'Handler message'])
+        self.assertEqual(received_messages, ['Core message', 'Handler message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
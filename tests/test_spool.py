@@ -0,0 +1,197 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import sinks as pyoslog_sinks
+from pyoslog import spool as pyoslog_spool
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'spool')
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture()
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.spool_path = os.path.join(self.temporary_directory.name, 'spool')
+
+    def tearDown(self):
+        self.capture.uninstall()
+        self.temporary_directory.cleanup()
+
+    def test_read(self):
+        self.assertRaises(ValueError, pyoslog_spool.Spool, self.spool_path, 1024, 1024)
+
+        spool = pyoslog_spool.Spool(self.spool_path, 64 * 1024, 1024)
+        for log_type in pyoslog_test_globals.TestLogTypes:
+            spool(self.log, log_type.value, 'Spooled message of type %s' % log_type)
+        spool(pyoslog_core.OS_LOG_DEFAULT, pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Default log object ☃')
+        entries = pyoslog_spool.read(self.spool_path)  # readable while the spool is still open
+        self.assertEqual(len(entries), len(pyoslog_test_globals.TestLogTypes) + 1)
+        for entry, log_type in zip(entries, pyoslog_test_globals.TestLogTypes):
+            self.assertEqual(entry.subsystem, pyoslog_test_globals.LOG_SUBSYSTEM)
+            self.assertEqual(entry.category, pyoslog_test_globals.LOG_CATEGORY)
+            self.assertEqual(entry.type, log_type)
+            self.assertEqual(entry.message, 'Spooled message of type %s' % log_type)
+        self.assertEqual(entries[-1][:4], (None, None, pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Default log object ☃'))
+        spool.close()
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'ignored after closing')
+
+        # reopening appends to the existing spool
+        spool = pyoslog_spool.Spool(self.spool_path, 64 * 1024, 1024)
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Appended')
+        spool.close()
+        entries = pyoslog_spool.read(self.spool_path)
+        self.assertEqual(len(entries), len(pyoslog_test_globals.TestLogTypes) + 2)
+        self.assertEqual(entries[-1].message, 'Appended')
+        self.assertEqual(len(set(e.timestamp for e in entries)), len(entries))
+
+        with open(os.path.join(self.temporary_directory.name, 'other'), 'wb') as other_file:
+            other_file.write(1024 * b'\0')
+        self.assertRaises(ValueError, pyoslog_spool.read, other_file.name)
+
+    def test_wrapping(self):
+        spool = pyoslog_spool.Spool(self.spool_path, 8 * 1024, 1024)
+        for i in range(1000):
+            spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Message %d' % i)
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 10000 * 'p')  # truncated to the spool's capacity
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Final message')
+        spool.close()
+        self.assertEqual(os.path.getsize(self.spool_path), 8 * 1024)
+
+        messages = [e.message for e in pyoslog_spool.read(self.spool_path)]
+        self.assertEqual(messages, ['Final message'])  # the huge message was overwritten when the spool wrapped
+
+        spool = pyoslog_spool.Spool(self.spool_path, 8 * 1024, 1024)
+        for i in range(1000):
+            spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Message %d' % i)
+        spool.close()
+        messages = [e.message for e in pyoslog_spool.read(self.spool_path)]
+        self.assertEqual(messages, ['Message %d' % i for i in range(1000 - len(messages), 1000)])
+        self.assertGreater(len(messages), 100)
+
+    def test_name_table(self):
+        spool = pyoslog_spool.Spool(self.spool_path, 16 * 1024, 128)
+        for i in range(10):
+            spool(pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, 'category-%d' % i),
+                  pyoslog_core.OS_LOG_TYPE_DEFAULT, 'Message %d' % i)
+        spool.close()
+
+        # log objects that do not fit in the table are stored inline
+        entries = pyoslog_spool.read(self.spool_path)
+        self.assertEqual([e.category for e in entries], ['category-%d' % i for i in range(10)])
+        self.assertEqual([e.message for e in entries], ['Message %d' % i for i in range(10)])
+
+    def test_crash(self):
+        script = ('import os\n'
+                  'from pyoslog import capture, core, spool\n'
+                  'capture.LogCapture().install()\n'  # so that the test also runs on unsupported platforms
+                  'log = core.os_log_create(%r, %r)\n'
+                  'spool_sink = spool.Spool(%r, 256 * 1024)\n'
+                  'for i in range(100):\n'
+                  '    core.os_log_with_type(log, core.OS_LOG_TYPE_FAULT, "Before crash", i, sinks=[spool_sink])\n'
+                  'os._exit(1)\n') % (pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY,
+                                      self.spool_path)
+        subprocess.run([sys.executable, '-c', script], stdout=subprocess.DEVNULL)
+
+        # a partially-written record is ignored
+        with open(self.spool_path, 'r+b') as spool_file:
+            contents = spool_file.read()
+            spool_file.seek(contents.rindex(b'Before crash 99'))
+            spool_file.write(b'Corrupted')
+
+        entries = pyoslog_spool.read(self.spool_path)
+        self.assertEqual([e.message for e in entries], ['Before crash %d' % i for i in range(99)])
+
+        self.assertEqual(pyoslog_spool.replay(self.spool_path), 99)
+        self.assertEqual([e.message for e in self.capture.find(log_object=self.log,
+                                                              log_type=pyoslog_core.OS_LOG_TYPE_FAULT)],
+                         ['Before crash %d' % i for i in range(99)])
+
+    def test_export(self):
+        spool = pyoslog_spool.Spool(self.spool_path, 256 * 1024)
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Exported message')
+        spool(pyoslog_core.OS_LOG_DEFAULT, pyoslog_core.OS_LOG_TYPE_INFO, 'Default log object')
+
+        output = io.StringIO()
+        self.assertEqual(pyoslog_spool.export_ndjson(self.spool_path, output), 2)
+        exported = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(exported[0]['subsystem'], pyoslog_test_globals.LOG_SUBSYSTEM)
+        self.assertEqual(exported[0]['category'], pyoslog_test_globals.LOG_CATEGORY)
+        self.assertEqual(exported[0]['type'], 'Error')
+        self.assertEqual(exported[0]['message'], 'Exported message')
+        self.assertIsInstance(exported[0]['timestamp'], float)
+        self.assertEqual(exported[1]['subsystem'], None)
+        self.assertEqual(exported[1]['type'], 'Info')
+
+        export_path = os.path.join(self.temporary_directory.name, 'export.ndjson')
+        pyoslog_spool._main(['export', self.spool_path, '--output', export_path])
+        with open(export_path) as export_file:
+            self.assertEqual(export_file.read(), output.getvalue())
+
+        pyoslog_spool._main(['replay', self.spool_path, '--clear'])
+        self.assertEqual(self.capture.count(), 2)
+        self.assertEqual(pyoslog_spool.read(self.spool_path), [])
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'After clearing')
+        spool.close()
+        self.assertEqual([e.message for e in pyoslog_spool.read(self.spool_path)], ['After clearing'])
+
+    def test_replay_and_clear(self):
+        # small spools use a non-default table size, which is read from the file rather than assumed
+        spool = pyoslog_spool.Spool(self.spool_path, 8192, 512)
+        for i in range(5):
+            spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Message %d' % i)
+
+        # messages stored while replaying (here, by the first replayed message) are not removed
+        original_os_log_with_type = pyoslog_spool.os_log_with_type
+
+        def os_log_with_type_and_store(log_object, log_type, message):
+            original_os_log_with_type(log_object, log_type, message)
+            if message == 'Message 0':
+                spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Stored while replaying')
+
+        with unittest.mock.patch.object(pyoslog_spool, 'os_log_with_type', os_log_with_type_and_store):
+            pyoslog_spool._main(['replay', self.spool_path, '--clear'])
+        self.assertEqual([e.message for e in self.capture.entries], ['Message %d' % i for i in range(5)])
+        self.assertEqual([e.message for e in pyoslog_spool.read(self.spool_path)], ['Stored while replaying'])
+
+        self.assertEqual(pyoslog_spool.replay(self.spool_path, clear=True), 1)
+        self.assertEqual(self.capture.last().message, 'Stored while replaying')
+        spool(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'After clearing')
+        spool.close()
+        self.assertEqual([e.message for e in pyoslog_spool.read(self.spool_path)], ['After clearing'])
+
+    def test_overflow(self):
+        spool = pyoslog_spool.Spool(self.spool_path, 256 * 1024)
+        blocked_sink = pyoslog_sinks.ThreadedSink(lambda *args: None, max_queue_size=1, overflow=spool)
+        blocked_sink._queue.put(None)  # stop the background thread so that the queue stays full
+        blocked_sink._thread.join()
+        blocked_sink._queue.put_nowait(('queued',))
+        for i in range(5):
+            blocked_sink(self.log, pyoslog_core.OS_LOG_TYPE_ERROR, 'Overflow %d' % i)
+        self.assertEqual(blocked_sink.dropped, 0)
+        spool.close()
+        self.assertEqual([e.message for e in pyoslog_spool.read(self.spool_path)], ['Overflow %d' % i
+                                                                                    for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+import unittest
+
+import packaging.version
+
+try:
+    import importlib.metadata as importlib_metadata  # get package version numbers - available in stdlib from python 3.8
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import importlib_metadata
+
+import pyoslog_test_globals
+from pyoslog import capture as pyoslog_capture
+from pyoslog import core as pyoslog_core
+from pyoslog import stream as pyoslog_stream
+
+print('Testing pyoslog', packaging.version.Version(importlib_metadata.version('pyoslog')), 'stream')
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.capture = pyoslog_capture.LogCapture()
+        self.capture.install()
+        self.log = pyoslog_core.os_log_create(pyoslog_test_globals.LOG_SUBSYSTEM, pyoslog_test_globals.LOG_CATEGORY)
+        self.stream = pyoslog_stream.Stream(self.log, pyoslog_core.OS_LOG_TYPE_INFO, flush_interval=None)
+
+    def tearDown(self):
+        self.stream.close()
+        self.capture.uninstall()
+
+    def messages(self):
+        return [e.message for e in self.capture.entries]
+
+    def test_line_buffering(self):
+        self.assertTrue(self.stream.writable())
+        self.assertEqual(self.stream.write('Partial '), 8)
+        self.assertEqual(self.messages(), [])
+        self.stream.write('line\nSecond')
+        self.assertEqual(self.messages(), ['Partial line'])
+        self.stream.write(' line\nThird line\nFourth')
+        self.assertEqual(self.messages(), ['Partial line', 'Second line\nThird line'])
+        self.stream.flush()
+        self.assertEqual(self.messages()[-1], 'Fourth')
+        self.assertEqual(self.capture.last().type, pyoslog_core.OS_LOG_TYPE_INFO)
+        self.assertEqual(self.capture.last().subsystem, pyoslog_test_globals.LOG_SUBSYSTEM)
+
+        self.stream.flush()  # nothing buffered, so nothing sent
+        self.stream.write('')
+        self.assertEqual(len(self.messages()), 3)
+        self.assertRaises(TypeError, self.stream.write, b'bytes')
+
+        self.stream.write('Sent when closed')
+        self.stream.close()
+        self.assertEqual(self.messages()[-1], 'Sent when closed')
+        self.assertRaises(ValueError, self.stream.write, 'closed')
+        self.assertRaises(ValueError, self.stream.writelines, ['closed'])
+
+    def test_writelines(self):
+        self.stream.writelines('Line %d\n' % i for i in range(200))
+        messages = self.messages()
+        self.assertEqual('\n'.join(messages).split('\n'), ['Line %d' % i for i in range(200)])
+        self.assertLess(len(messages), 5)
+        for message in messages:
+            self.assertLessEqual(len(message), pyoslog_core._MAX_MESSAGE_LENGTH)
+
+    def test_maximum_length(self):
+        self.stream.write(2500 * 'p')
+        self.assertEqual([len(m) for m in self.messages()], 2 * [pyoslog_core._MAX_MESSAGE_LENGTH])
+        self.capture.clear()
+
+        self.stream.write('\nshort\n' + 1500 * 'q' + '\n')
+        self.assertEqual(self.messages(), [(2500 - 2 * pyoslog_core._MAX_MESSAGE_LENGTH) * 'p' + '\nshort',
+                                           pyoslog_core._MAX_MESSAGE_LENGTH * 'q',
+                                           (1500 - pyoslog_core._MAX_MESSAGE_LENGTH) * 'q'])
+
+    def test_flush_interval(self):
+        timed_stream = pyoslog_stream.Stream(self.log, flush_interval=0.01)
+        timed_stream.write('Waiting for the timer')
+        self.assertEqual(self.capture.wait_for(pattern='^Waiting for the timer$', timeout=5)[0].type,
+                         pyoslog_core.OS_LOG_TYPE_DEFAULT)
+
+        # complete lines cancel the timer
+        timed_stream.write('Partial')
+        timed_stream.write(' line\n')
+        self.assertIsNone(timed_stream._flush_deadline)
+        self.assertNotIn(timed_stream, pyoslog_stream._flusher.pending)
+        time.sleep(0.05)
+        self.assertEqual(self.messages(), ['Waiting for the timer', 'Partial line'])
+        timed_stream.close()
+
+        # partial lines in any number of streams are sent by a single thread
+        self.capture.clear()
+        timed_streams = [pyoslog_stream.Stream(self.log, flush_interval=0.01 * (i % 3 + 1)) for i in range(20)]
+        for i, stream in enumerate(timed_streams):
+            stream.write('Stream %d' % i)
+        self.assertEqual(len([t for t in threading.enumerate() if t.name == 'pyoslog-stream']), 1)
+        self.capture.wait_for(pattern='^Stream 19$', timeout=5)
+        time.sleep(0.05)
+        self.assertEqual(sorted(self.messages()), sorted('Stream %d' % i for i in range(20)))
+        for stream in timed_streams:
+            stream.close()
+
+    def test_redirect(self):
+        original_stdout, original_stderr = sys.stdout, sys.stderr
+        with pyoslog_stream.redirect_stdout(self.log) as stdout_stream:
+            self.assertIs(sys.stdout, stdout_stream)
+            print('Printed', 'message')
+            print('Unfinished', end='')
+        self.assertIs(sys.stdout, original_stdout)
+        self.assertTrue(stdout_stream.closed)
+        self.assertEqual(self.messages(), ['Printed message', 'Unfinished'])
+
+        with pyoslog_stream.redirect_stderr():
+            print('Error message', file=sys.stderr)
+        self.assertIs(sys.stderr, original_stderr)
+        self.assertEqual(self.capture.last(), self.capture.last(log_object=pyoslog_core.OS_LOG_DEFAULT,
+                                                                log_type=pyoslog_core.OS_LOG_TYPE_ERROR))
+        self.assertEqual(self.capture.last().message, 'Error message')
+
+
+if __name__ == '__main__':
+    unittest.main()